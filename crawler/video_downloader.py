@@ -1,10 +1,17 @@
 import os
 import json
+import time
+import threading
+from contextlib import contextmanager
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from pathlib import Path
 from typing import Dict, Optional, List
-import yt_dlp
 from rich.console import Console
-from rich.progress import Progress, SpinnerColumn, TextColumn, BarColumn, TaskProgressColumn
+
+
+# get_video_info 返回的视频信息字段
+_INFO_FIELDS = ('title', 'duration', 'view_count', 'like_count', 'upload_date',
+                'uploader', 'description', 'thumbnail')
 
 
 class VideoDownloader:
@@ -12,6 +19,18 @@ class VideoDownloader:
     通用视频下载器，支持抖音、快手、B站等平台
     """
     
+    # 下载完成后查找视频文件时识别的扩展名，按优先级排列
+    VIDEO_EXTENSIONS = ('.mp4', '.webm', '.mkv')
+    
+    # 浅层展开时指向列表页而非单个视频的条目，按其提取器名（ie_key）的后缀识别，
+    # 如频道主页下的标签页 (YoutubeTab)；以及递归展开的最大深度
+    LIST_IE_SUFFIXES = ('Tab', 'Playlist', 'Channel', 'User')
+    LIST_MAX_DEPTH = 2
+    
+    # 视频信息缓存：每个实例最多保留的条数，以及过期后重新请求的时长（秒）
+    INFO_CACHE_SIZE = 256
+    INFO_CACHE_TTL = 600
+    
     def __init__(self, console: Console = None, download_path: str = "./downloads"):
         """
         初始化视频下载器
@@ -19,9 +38,26 @@ class VideoDownloader:
         :param download_path: 下载保存路径
         """
         self.console = console or Console()
+        self._ensured_dirs = set()
         self.download_path = Path(download_path)
-        self.download_path.mkdir(parents=True, exist_ok=True)
+        self._ensure_dir(self.download_path)
         self.custom_opts = {}
+        # 空闲的 YoutubeDL 实例，按与输出路径无关的配置分组；
+        # 每个实例同一时间只借给一个线程，数量不超过同时下载的线程数
+        self._ydl_pool = {}
+        self._ydl_lock = threading.Lock()
+        # 本实例获取过的视频信息: URL -> (获取时间, 按 _INFO_FIELDS 排列的字段值)，失败的请求不缓存
+        self._info_cache = {}
+    
+    def _ensure_dir(self, path: Path):
+        """
+        创建目录，已确认存在的目录不再重复创建
+        :param path: 目录路径
+        """
+        key = str(path)
+        if key not in self._ensured_dirs:
+            path.mkdir(parents=True, exist_ok=True)
+            self._ensured_dirs.add(key)
     
     def configure_options(self, output_path: str = None, format_selector: str = None, save_metadata: bool = True):
         """
@@ -32,7 +68,7 @@ class VideoDownloader:
         """
         if output_path:
             self.download_path = Path(output_path)
-            self.download_path.mkdir(parents=True, exist_ok=True)
+            self._ensure_dir(self.download_path)
         
         if format_selector:
             self.custom_opts['format'] = format_selector
@@ -40,15 +76,16 @@ class VideoDownloader:
         self.custom_opts['writeinfojson'] = save_metadata
         self.custom_opts['writethumbnail'] = save_metadata
         
-    def _get_ydl_opts(self, output_path: Path) -> Dict:
+    def _get_ydl_opts(self, minimal: bool = False) -> Dict:
         """
-        获取 yt-dlp 配置选项
+        获取 yt-dlp 配置选项，不含输出目录（每次下载时通过 paths 指定）
+        :param minimal: 是否只下载视频文件，默认不保存信息JSON和缩略图
         """
         opts = {
-            'outtmpl': str(output_path / '%(title)s.%(ext)s'),
+            'outtmpl': '%(title)s.%(ext)s',
             'format': 'best[height<=720]',  # 优先下载720p以下的视频
-            'writeinfojson': True,  # 保存视频信息为JSON
-            'writethumbnail': True,  # 下载缩略图
+            'writeinfojson': not minimal,  # 保存视频信息为JSON
+            'writethumbnail': not minimal,  # 下载缩略图
             'writesubtitles': False,  # 暂不下载字幕
             'ignoreerrors': True,  # 忽略错误继续下载
             'no_warnings': False,
@@ -58,6 +95,43 @@ class VideoDownloader:
         opts.update(self.custom_opts)
         return opts
     
+    @contextmanager
+    def _borrow_ydl(self, opts: Dict, output_path: Path):
+        """
+        借出一个按配置复用的 YoutubeDL 实例，避免重复解析选项和注册提取器
+        输出目录不参与复用的判断，借用期间实例只属于当前线程，通过 paths 参数指向本次的输出目录
+        :param opts: 与输出路径无关的 yt-dlp 配置选项
+        :param output_path: 本次下载的输出目录
+        :return: YoutubeDL 实例
+        """
+        # yt_dlp 导入较慢，仅在真正需要下载/解析时才加载
+        import yt_dlp
+        
+        key = frozenset((k, repr(v)) for k, v in opts.items())
+        with self._ydl_lock:
+            idle = self._ydl_pool.get(key)
+            ydl = idle.pop() if idle else None
+        if ydl is None:
+            ydl = yt_dlp.YoutubeDL(opts)
+        
+        ydl.params['paths'] = {'home': str(output_path)}
+        try:
+            yield ydl
+        finally:
+            with self._ydl_lock:
+                self._ydl_pool.setdefault(key, []).append(ydl)
+    
+    def close(self):
+        """
+        关闭所有空闲的 YoutubeDL 实例，释放其 HTTP 会话和文件句柄，并清空视频信息缓存
+        """
+        self._info_cache.clear()
+        with self._ydl_lock:
+            pool, self._ydl_pool = self._ydl_pool, {}
+        for idle in pool.values():
+            for ydl in idle:
+                ydl.close()
+    
     def download_video(self, url: str, custom_filename: str = None) -> Optional[str]:
         """
         下载视频并返回文件路径
@@ -65,31 +139,49 @@ class VideoDownloader:
         :param custom_filename: 自定义文件名
         :return: 下载的视频文件路径
         """
-        result = self.download_single_video(url, custom_filename)
+        # 只需要视频文件，除非通过 configure_options 显式开启，否则不下载元数据和缩略图
+        result = self.download_single_video(url, custom_filename, minimal=True)
         if result:
             # 尝试找到下载的视频文件
-            download_dir = Path(result['download_path'])
-            video_files = list(download_dir.glob("*.mp4")) + list(download_dir.glob("*.webm")) + list(download_dir.glob("*.mkv"))
-            if video_files:
-                return str(video_files[0])
+            return self._find_video_file(result['download_path'])
+        return None
+    
+    def _find_video_file(self, download_dir: str) -> Optional[str]:
+        """
+        单次遍历目录查找视频文件，按 VIDEO_EXTENSIONS 的顺序优先返回
+        :param download_dir: 下载目录
+        :return: 视频文件路径
+        """
+        found = {}
+        with os.scandir(download_dir) as entries:
+            for entry in entries:
+                ext = os.path.splitext(entry.name)[1].lower()
+                if ext in self.VIDEO_EXTENSIONS and ext not in found and entry.is_file():
+                    if ext == self.VIDEO_EXTENSIONS[0]:
+                        return entry.path
+                    found[ext] = entry.path
+        for ext in self.VIDEO_EXTENSIONS:
+            if ext in found:
+                return found[ext]
         return None
     
-    def download_single_video(self, url: str, custom_filename: str = None) -> Optional[Dict]:
+    def download_single_video(self, url: str, custom_filename: str = None, minimal: bool = False) -> Optional[Dict]:
         """
         下载单个视频
         :param url: 视频链接
         :param custom_filename: 自定义文件名
+        :param minimal: 是否只下载视频文件
         :return: 下载结果信息
         """
         try:
             output_path = self.download_path
             if custom_filename:
                 output_path = output_path / custom_filename
-                output_path.mkdir(parents=True, exist_ok=True)
+                self._ensure_dir(output_path)
             
-            ydl_opts = self._get_ydl_opts(output_path)
+            ydl_opts = self._get_ydl_opts(minimal=minimal)
             
-            with yt_dlp.YoutubeDL(ydl_opts) as ydl:
+            with self._borrow_ydl(ydl_opts, output_path) as ydl:
                 # 先获取视频信息
                 info = ydl.extract_info(url, download=False)
                 
@@ -97,33 +189,45 @@ class VideoDownloader:
                 self.console.print(f"[cyan]📊 时长: {info.get('duration', 0)}秒[/]")
                 self.console.print(f"[cyan]👀 观看数: {info.get('view_count', 'Unknown')}[/]")
                 
-                # 开始下载
-                ydl.download([url])
-                
-                # 返回视频信息
-                return {
-                    'title': info.get('title'),
-                    'duration': info.get('duration'),
-                    'view_count': info.get('view_count'),
-                    'like_count': info.get('like_count'),
-                    'upload_date': info.get('upload_date'),
-                    'uploader': info.get('uploader'),
-                    'description': info.get('description'),
-                    'url': url,
-                    'download_path': str(output_path)
-                }
+                # 开始下载，复用已提取的信息，避免再次请求
+                ydl.process_ie_result(info, download=True)
+            
+            # 返回视频信息
+            return {
+                'title': info.get('title'),
+                'duration': info.get('duration'),
+                'view_count': info.get('view_count'),
+                'like_count': info.get('like_count'),
+                'upload_date': info.get('upload_date'),
+                'uploader': info.get('uploader'),
+                'description': info.get('description'),
+                'url': url,
+                'download_path': str(output_path)
+            }
                 
         except Exception as e:
             self.console.print(f"[red]❌ 下载失败: {str(e)}[/]")
             return None
     
-    def download_batch_videos(self, urls: List[str]) -> List[Dict]:
+    def download_batch_videos(self, urls: List[str], concurrency: int = 4) -> List[Dict]:
         """
         批量下载视频
         :param urls: 视频链接列表
+        :param concurrency: 并发下载数
         :return: 下载结果列表
         """
-        results = []
+        n = len(urls)
+        
+        # 单个视频无需启动进度条和线程池
+        if n <= 1:
+            results = [r for r in (self.download_single_video(url, "video_1") for url in urls) if r]
+            self.console.print(f"[green]✅ 批量下载完成，成功下载 {len(results)}/{n} 个视频[/]")
+            return results
+        
+        from rich.progress import Progress, SpinnerColumn, TextColumn, BarColumn, TaskProgressColumn
+        
+        # 按提交顺序存放结果，保持与输入URL的对应关系
+        results: List[Optional[Dict]] = [None] * n
         
         with Progress(
             SpinnerColumn(),
@@ -132,39 +236,108 @@ class VideoDownloader:
             TaskProgressColumn(),
             console=self.console
         ) as progress:
-            task = progress.add_task("[cyan]批量下载进度", total=len(urls))
+            task = progress.add_task("[cyan]批量下载进度", total=n)
             
-            for i, url in enumerate(urls):
-                progress.update(task, description=f"[cyan]下载第 {i+1}/{len(urls)} 个视频")
-                result = self.download_single_video(url, f"video_{i+1}")
-                if result:
-                    results.append(result)
-                progress.advance(task)
-        
-        self.console.print(f"[green]✅ 批量下载完成，成功下载 {len(results)}/{len(urls)} 个视频[/]")
+            # 下载以网络等待为主，使用线程池让多个视频同时下载
+            with ThreadPoolExecutor(max_workers=concurrency) as executor:
+                futures = {
+                    executor.submit(self.download_single_video, url, f"video_{i+1}"): i
+                    for i, url in enumerate(urls)
+                }
+                
+                for done, future in enumerate(as_completed(futures), 1):
+                    results[futures[future]] = future.result()
+                    progress.update(task, advance=1, description=f"[cyan]已完成 {done}/{n} 个视频")
+        
+        results = [r for r in results if r]
+        self.console.print(f"[green]✅ 批量下载完成，成功下载 {len(results)}/{n} 个视频[/]")
         return results
     
-    def get_video_info(self, url: str) -> Optional[Dict]:
+    def list_entries(self, url: str) -> List[str]:
+        """
+        浅层展开播放列表或频道链接，只获取各视频的链接，不抓取详情页
+        频道主页展开得到的是 /videos、/shorts 等标签页，继续展开到其中的视频
+        :param url: 播放列表、频道或单个视频链接
+        :return: 视频链接列表，非播放列表时返回原链接
+        """
+        import yt_dlp
+        
+        try:
+            with yt_dlp.YoutubeDL({'extract_flat': 'in_playlist', 'quiet': True}) as ydl:
+                info = ydl.extract_info(url, download=False)
+                entries = self._flat_video_urls(ydl, info) if info and info.get('entries') else None
+        except Exception as e:
+            self.console.print(f"[red]❌ 展开播放列表失败: {str(e)}[/]")
+            return [url]
+        
+        return entries or [url]
+    
+    def _flat_video_urls(self, ydl, info: Dict, depth: int = 0) -> List[str]:
+        """
+        收集浅层展开结果中的视频链接，嵌套的播放列表和指向列表页的条目递归展开
+        :param ydl: 以 extract_flat 配置的 YoutubeDL 实例
+        :param info: extract_info 返回的播放列表信息
+        :param depth: 当前递归深度
+        :return: 视频链接列表
+        """
+        urls = []
+        for entry in info.get('entries') or []:
+            if not entry:
+                continue
+            if entry.get('entries') is not None:
+                # 已展开的嵌套播放列表
+                urls.extend(self._flat_video_urls(ydl, entry, depth))
+            elif entry.get('_type') == 'url' and (entry.get('ie_key') or '').endswith(self.LIST_IE_SUFFIXES):
+                # 指向标签页、播放列表等列表页的链接，再展开一层
+                if depth >= self.LIST_MAX_DEPTH:
+                    continue
+                try:
+                    nested = ydl.extract_info(entry['url'], download=False)
+                except Exception as e:
+                    self.console.print(f"[yellow]⚠️ 展开 {entry['url']} 失败: {str(e)}[/]")
+                    continue
+                if nested:
+                    urls.extend(self._flat_video_urls(ydl, nested, depth + 1))
+            else:
+                urls.append(entry.get('url') or entry.get('id'))
+        return urls
+    
+    def _extract_info(self, url: str, refresh: bool = False) -> tuple:
+        """
+        提取视频信息，同一实例内相同URL在缓存有效期内只请求一次
+        :param url: 视频链接
+        :param refresh: 忽略缓存重新请求
+        :return: 按 _INFO_FIELDS 顺序排列的字段值
+        """
+        now = time.monotonic()
+        cached = self._info_cache.get(url)
+        if cached and not refresh and now - cached[0] < self.INFO_CACHE_TTL:
+            return cached[1]
+        
+        import yt_dlp
+        
+        with yt_dlp.YoutubeDL({'quiet': True}) as ydl:
+            info = ydl.extract_info(url, download=False)
+        fields = tuple(info.get(field) for field in _INFO_FIELDS)
+        
+        # 超出条数时丢弃最早写入的一条
+        self._info_cache.pop(url, None)
+        if len(self._info_cache) >= self.INFO_CACHE_SIZE:
+            self._info_cache.pop(next(iter(self._info_cache)), None)
+        self._info_cache[url] = (now, fields)
+        return fields
+    
+    def get_video_info(self, url: str, refresh: bool = False) -> Optional[Dict]:
         """
         仅获取视频信息，不下载
         :param url: 视频链接
+        :param refresh: 忽略缓存重新请求
         :return: 视频信息字典
         """
         try:
-            ydl_opts = {'quiet': True}
-            with yt_dlp.YoutubeDL(ydl_opts) as ydl:
-                info = ydl.extract_info(url, download=False)
-                return {
-                    'title': info.get('title'),
-                    'duration': info.get('duration'),
-                    'view_count': info.get('view_count'),
-                    'like_count': info.get('like_count'),
-                    'upload_date': info.get('upload_date'),
-                    'uploader': info.get('uploader'),
-                    'description': info.get('description'),
-                    'thumbnail': info.get('thumbnail'),
-                    'url': url
-                }
+            video_info = dict(zip(_INFO_FIELDS, self._extract_info(url, refresh)))
+            video_info['url'] = url
+            return video_info
         except Exception as e:
             self.console.print(f"[red]❌ 获取视频信息失败: {str(e)}[/]")
             return None
\ No newline at end of file
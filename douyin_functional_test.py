@@ -8,13 +8,19 @@
 import sys
 import tempfile
 import shutil
+from contextlib import nullcontext
 from pathlib import Path
 from rich.console import Console
 from rich.panel import Panel
+from utils.text import preview
 
 # 测试用的抖音视频链接
 TEST_DOUYIN_URL = "https://www.douyin.com/jingxuan?modal_id=7526877413813292329"
 
+def _temp_root(root=None):
+    """复用调用方传入的临时根目录，未传入时单独创建一个"""
+    return nullcontext(root) if root else tempfile.TemporaryDirectory()
+
 def test_video_info_extraction():
     """测试视频信息提取"""
     console = Console()
@@ -40,7 +46,7 @@ def test_video_info_extraction():
         console.print(f"  💥 视频信息提取异常: {e}")
         return False, None
 
-def test_audio_transcription():
+def test_audio_transcription(root=None):
     """测试音频转写功能"""
     console = Console()
     console.print("\n🎵 测试音频转写功能...")
@@ -48,8 +54,8 @@ def test_audio_transcription():
     try:
         from parser.audio_parser import AudioParser
         
-        # 创建临时目录
-        with tempfile.TemporaryDirectory() as temp_dir:
+        # 使用共享的临时目录
+        with _temp_root(root) as temp_dir:
             temp_path = Path(temp_dir)
             audio_dir = temp_path / "audio"
             transcript_dir = temp_path / "transcripts"
@@ -69,8 +75,7 @@ def test_audio_transcription():
             
             if result and result.get('text'):
                 console.print("  ✅ 音频转写成功")
-                text = result['text'][:200] + "..." if len(result['text']) > 200 else result['text']
-                console.print(f"  📝 转写文本预览: {text}")
+                console.print(f"  📝 转写文本预览: {preview(result['text'], 200)}")
                 console.print(f"  📊 文本长度: {len(result['text'])} 字符")
                 return True, result
             else:
@@ -81,7 +86,7 @@ def test_audio_transcription():
         console.print(f"  💥 音频转写异常: {e}")
         return False, None
 
-def test_report_generation(video_info, transcription_result):
+def test_report_generation(video_info, transcription_result, root=None):
     """测试报告生成功能"""
     console = Console()
     console.print("\n📊 测试报告生成功能...")
@@ -89,8 +94,8 @@ def test_report_generation(video_info, transcription_result):
     try:
         from report.report_generator import ReportGenerator
         
-        # 创建临时目录
-        with tempfile.TemporaryDirectory() as temp_dir:
+        # 使用共享的临时目录
+        with _temp_root(root) as temp_dir:
             temp_path = Path(temp_dir)
             reports_dir = temp_path / "reports"
             reports_dir.mkdir(exist_ok=True)
@@ -129,7 +134,7 @@ def test_report_generation(video_info, transcription_result):
         console.print(f"  💥 报告生成异常: {e}")
         return False
 
-def test_integrated_analysis():
+def test_integrated_analysis(root=None):
     """测试集成分析功能"""
     console = Console()
     console.print("\n🚀 测试集成分析功能...")
@@ -137,9 +142,9 @@ def test_integrated_analysis():
     try:
         from main import BVSAnalyzer
         
-        # 创建临时目录
-        with tempfile.TemporaryDirectory() as temp_dir:
-            analyzer = BVSAnalyzer(output_dir=temp_dir)
+        # 使用共享的临时目录
+        with _temp_root(root) as temp_dir:
+            analyzer = BVSAnalyzer(output_dir=str(Path(temp_dir) / "analysis"))
             
             console.print("  🔄 开始完整分析流程...")
             result = analyzer.analyze_single_video(
@@ -186,38 +191,40 @@ def main():
     video_info = None
     transcription_result = None
     
-    # 执行前两个测试
-    for test_name, test_func in tests:
-        try:
-            if test_name == "视频信息提取":
-                success, data = test_func()
-                if success:
-                    video_info = data
-                results.append((test_name, success))
-            elif test_name == "音频转写":
-                success, data = test_func()
-                if success:
-                    transcription_result = data
-                results.append((test_name, success))
-        except Exception as e:
-            console.print(f"💥 {test_name} 测试异常: {e}")
-            results.append((test_name, False))
+    # 所有测试共用一个临时根目录，结束时统一清理
+    with tempfile.TemporaryDirectory() as root:
+        # 执行前两个测试
+        for test_name, test_func in tests:
+            try:
+                if test_name == "视频信息提取":
+                    success, data = test_func()
+                    if success:
+                        video_info = data
+                    results.append((test_name, success))
+                elif test_name == "音频转写":
+                    success, data = test_func(root)
+                    if success:
+                        transcription_result = data
+                    results.append((test_name, success))
+            except Exception as e:
+                console.print(f"💥 {test_name} 测试异常: {e}")
+                results.append((test_name, False))
     
-    # 如果前两个测试成功，继续后续测试
-    if video_info and transcription_result:
-        try:
-            success = test_report_generation(video_info, transcription_result)
-            results.append(("报告生成", success))
-        except Exception as e:
-            console.print(f"💥 报告生成测试异常: {e}")
-            results.append(("报告生成", False))
+        # 如果前两个测试成功，继续后续测试
+        if video_info and transcription_result:
+            try:
+                success = test_report_generation(video_info, transcription_result, root)
+                results.append(("报告生成", success))
+            except Exception as e:
+                console.print(f"💥 报告生成测试异常: {e}")
+                results.append(("报告生成", False))
         
-        try:
-            success, _ = test_integrated_analysis()
-            results.append(("集成分析", success))
-        except Exception as e:
-            console.print(f"💥 集成分析测试异常: {e}")
-            results.append(("集成分析", False))
+            try:
+                success, _ = test_integrated_analysis(root)
+                results.append(("集成分析", success))
+            except Exception as e:
+                console.print(f"💥 集成分析测试异常: {e}")
+                results.append(("集成分析", False))
     
     # 显示结果
     console.print("\n" + "=" * 60)
@@ -8,26 +8,36 @@
 import sys
 import tempfile
 import shutil
+from functools import lru_cache
 from pathlib import Path
 from rich.console import Console
 from rich.panel import Panel
 from rich.progress import Progress, SpinnerColumn, TextColumn
+from utils.douyin import MODAL_RE
+from utils.text import preview
+
+# 所有测试共用一个控制台
+CONSOLE = Console()
 
 # 用户提供的抖音链接
 DOUYIN_URL = "https://www.douyin.com/jingxuan?modal_id=7526877413813292329"
 
 def test_douyin_url_parsing():
     """测试抖音URL解析"""
-    console = Console()
+    console = CONSOLE
     console.print("\n🔍 测试抖音URL解析...")
     
     try:
         from crawler.video_downloader import VideoDownloader
+        from utils.douyin import normalize_url
         
         downloader = VideoDownloader(console=console)
         
         # 尝试获取视频信息
         console.print(f"  🔗 测试URL: {DOUYIN_URL}")
+        video_url = normalize_url(DOUYIN_URL)
+        if video_url != DOUYIN_URL:
+            console.print(f"  🔁 标准化URL: {video_url}")
         
         with Progress(
             SpinnerColumn(),
@@ -37,7 +47,7 @@ def test_douyin_url_parsing():
             task = progress.add_task("正在解析抖音视频信息...", total=None)
             
             try:
-                video_info = downloader.get_video_info(DOUYIN_URL)
+                video_info = downloader.get_video_info(video_url)
                 progress.update(task, completed=True)
                 
                 if video_info:
@@ -71,7 +81,7 @@ def test_douyin_url_parsing():
 
 def test_alternative_douyin_methods():
     """测试替代的抖音处理方法"""
-    console = Console()
+    console = CONSOLE
     console.print("\n🔄 测试替代抖音处理方法...")
     
     try:
@@ -79,8 +89,7 @@ def test_alternative_douyin_methods():
         console.print("  📋 方法1: 尝试不同的URL格式")
         
         # 从原URL提取modal_id
-        import re
-        modal_match = re.search(r'modal_id=([0-9]+)', DOUYIN_URL)
+        modal_match = MODAL_RE.search(DOUYIN_URL)
         if modal_match:
             modal_id = modal_match.group(1)
             console.print(f"  🆔 提取到modal_id: {modal_id}")
@@ -105,9 +114,19 @@ def test_alternative_douyin_methods():
         console.print(f"  💥 替代方法测试异常: {e}")
         return False, str(e)
 
+@lru_cache(maxsize=1)
+def _douyin_like_extractors():
+    """
+    按名称直接查找抖音相关提取器，避免枚举全部提取器
+    :return: 提取器类列表
+    """
+    import yt_dlp.extractor
+    return [yt_dlp.extractor.get_info_extractor(name) for name in ('Douyin', 'TikTok')
+            if hasattr(yt_dlp.extractor, name + 'IE')]
+
 def test_yt_dlp_douyin_support():
     """测试yt-dlp对抖音的支持情况"""
-    console = Console()
+    console = CONSOLE
     console.print("\n🔧 测试yt-dlp抖音支持情况...")
     
     try:
@@ -117,13 +136,12 @@ def test_yt_dlp_douyin_support():
         console.print(f"  📦 yt-dlp版本: {yt_dlp.version.__version__}")
         
         # 检查支持的提取器
-        extractors = yt_dlp.extractor.list_extractors()
-        douyin_extractors = [e for e in extractors if 'douyin' in e.lower() or 'tiktok' in e.lower()]
+        douyin_extractors = _douyin_like_extractors()
         
         if douyin_extractors:
             console.print("  ✅ 找到抖音相关提取器:")
             for extractor in douyin_extractors:
-                console.print(f"    - {extractor}")
+                console.print(f"    - {extractor.IE_NAME}")
         else:
             console.print("  ❌ 未找到抖音相关提取器")
         
@@ -157,7 +175,7 @@ def test_yt_dlp_douyin_support():
 
 def test_mock_douyin_analysis():
     """使用模拟数据测试抖音分析流程"""
-    console = Console()
+    console = CONSOLE
     console.print("\n🎭 使用模拟数据测试抖音分析流程...")
     
     try:
@@ -223,9 +241,7 @@ def test_mock_douyin_analysis():
         from report.report_generator import ReportGenerator
         
         with tempfile.TemporaryDirectory() as temp_dir:
-            temp_path = Path(temp_dir)
-            reports_dir = temp_path / "reports"
-            reports_dir.mkdir(exist_ok=True)
+            reports_dir = Path(temp_dir) / "reports"
             
             reporter = ReportGenerator(console=console)
             
@@ -262,7 +278,7 @@ def test_mock_douyin_analysis():
 
 def test_douyin_url_recommendations():
     """提供抖音URL处理建议"""
-    console = Console()
+    console = CONSOLE
     console.print("\n💡 抖音URL处理建议...")
     
     recommendations = [
@@ -285,7 +301,7 @@ def test_douyin_url_recommendations():
 
 def main():
     """主测试函数"""
-    console = Console()
+    console = CONSOLE
     
     console.print(Panel(
         f"🎵 BVS Analyzer 抖音专用测试\n\n测试URL: {DOUYIN_URL}\n\n本测试将验证系统对抖音视频的处理能力",
@@ -329,7 +345,7 @@ def main():
         if success:
             success_count += 1
         elif data and isinstance(data, str):
-            console.print(f"    错误信息: {data[:100]}..." if len(data) > 100 else f"    错误信息: {data}")
+            console.print(f"    错误信息: {preview(data, 100)}")
     
     total_count = len(results)
     console.print(f"\n总计: {success_count}/{total_count} 通过")
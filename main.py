@@ -11,17 +11,57 @@ BVS Analyzer - 视频结构分析工具
 """
 
 import argparse
+import asyncio
+import hashlib
+import json
+import multiprocessing
+import os
+import re
 import sys
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor, as_completed
 from pathlib import Path
 from typing import List, Optional
 from rich.console import Console
 from rich.panel import Panel
-from rich.progress import Progress, SpinnerColumn, TextColumn
+from rich.progress import (Progress, SpinnerColumn, TextColumn, BarColumn,
+                           MofNCompleteColumn, TimeRemainingColumn)
 
 # 导入自定义模块
-from crawler.video_downloader import VideoDownloader
-from parser.audio_parser import AudioParser
-from report.report_generator import ReportGenerator
+from crawler.metadata_cache import MetadataCache
+from utils import douyin
+
+
+# 播放列表、频道、用户主页等包含多个视频的链接；
+# /@用户名 只匹配主页本身及其视频列表页，/@用户名/video/ID 这类单个视频链接不算
+_PLAYLIST_RE = re.compile(
+    r'[?&]list=|/playlist|/channel/|/user/|space\.bilibili\.com/|/profile/'
+    r'|/@[^/?#]+(?:/(?:videos|shorts|streams))?/?(?:$|[?#])'
+)
+
+
+# 本进程内已创建过的输出目录
+_DIR_CACHE = set()
+
+
+def _is_playlist_url(url: str) -> bool:
+    """
+    判断链接是否指向播放列表、频道等多视频页面
+    :param url: 视频URL
+    :return: 是否需要先展开为多个视频链接
+    """
+    return bool(_PLAYLIST_RE.search(url)) and not douyin.MODAL_RE.search(url)
+
+
+def _video_id(url: str) -> str:
+    """
+    由URL得到稳定的视频标识，用作元数据缓存的键
+    :param url: 标准化后的视频URL
+    :return: 抖音视频返回数字ID，其他平台返回URL的哈希
+    """
+    douyin_id = douyin.video_id(url)
+    if douyin_id:
+        return f"douyin_{douyin_id}"
+    return hashlib.sha1(url.encode('utf-8')).hexdigest()
 
 
 class BVSAnalyzer:
@@ -29,19 +69,32 @@ class BVSAnalyzer:
     BVS分析器主类，协调各个模块完成视频分析任务
     """
     
-    def __init__(self, output_dir: str = "output"):
+    def __init__(self, output_dir: str = "output", quiet: bool = False, parser=None,
+                 cache_transcripts: bool = False):
         """
         初始化BVS分析器
         :param output_dir: 输出目录
+        :param quiet: 是否关闭控制台输出（并行工作进程中使用）
+        :param parser: 复用已加载模型的 AudioParser，为None时新建
+        :param cache_transcripts: 将转写结果缓存到输出目录下，同一音频再次分析时直接读取
         """
-        self.console = Console()
+        self.console = Console(quiet=quiet)
         self.output_dir = Path(output_dir)
-        self.output_dir.mkdir(exist_ok=True)
+        self.cache_transcripts = cache_transcripts
+        
+        # 各模块依赖 yt-dlp、whisper(torch) 等较重的库，延迟到创建分析器时导入，
+        # 使 --help、参数错误等情况能快速返回
+        from crawler.video_downloader import VideoDownloader
+        from report.report_generator import ReportGenerator
         
-        # 初始化各个模块
+        # 初始化各个模块；音频解析器加载模型较慢，首次使用时才创建（见 parser 属性）
         self.downloader = VideoDownloader(console=self.console)
-        self.parser = AudioParser(console=self.console)
         self.reporter = ReportGenerator(console=self.console)
+        self.meta_cache = MetadataCache(self.output_dir / ".meta_cache")
+        self.transcript_cache_dir = self.output_dir / ".transcript_cache" if cache_transcripts else None
+        self._parser = parser
+        if parser is not None and cache_transcripts:
+            parser.cache_dir = self.transcript_cache_dir
         
         # 设置输出路径
         self.video_dir = self.output_dir / "videos"
@@ -49,126 +102,139 @@ class BVSAnalyzer:
         self.transcripts_dir = self.output_dir / "transcripts"
         self.reports_dir = self.output_dir / "reports"
         
-        # 创建必要的目录
-        for directory in [self.video_dir, self.audio_dir, self.transcripts_dir, self.reports_dir]:
-            directory.mkdir(exist_ok=True)
+        # 创建必要的目录（输出目录随子目录一并创建），同一进程内已创建过的跳过
+        for directory in (self.video_dir, self.audio_dir, self.transcripts_dir, self.reports_dir):
+            if directory not in _DIR_CACHE:
+                directory.mkdir(parents=True, exist_ok=True)
+                _DIR_CACHE.add(directory)
+    
+    @property
+    def parser(self):
+        """
+        音频解析器，首次使用时才创建并加载 Whisper 模型；
+        进程池批量分析时各工作进程各自加载模型，主进程不会加载
+        """
+        if self._parser is None:
+            from parser.audio_parser import AudioParser
+            self._parser = AudioParser(console=self.console, cache_dir=self.transcript_cache_dir)
+        return self._parser
     
     def analyze_single_video(self, url: str, download_video: bool = True, 
-                           generate_report: bool = True) -> dict:
+                           generate_report: bool = True, quiet: bool = False,
+                           force: bool = False) -> dict:
         """
         分析单个视频
         :param url: 视频URL
         :param download_video: 是否下载视频文件
         :param generate_report: 是否生成分析报告
+        :param quiet: 不显示开始/完成面板、步骤进度和分析摘要（批量分析时使用）
+        :param force: 即使已有分析报告也重新分析
         :return: 分析结果字典
         """
+        url = douyin.normalize_url(url)
+        video_id = _video_id(url)
+        
+        # 已生成过报告的视频直接复用上次的结果
+        if not force:
+            cached = self._load_existing_result(video_id)
+            if cached:
+                self.console.print(f"[cyan]⏭️ 已有分析报告，跳过: {url}[/]")
+                return cached
+        
         try:
-            self.console.print(Panel(
-                f"🎬 开始分析视频: {url}",
-                title="BVS Analyzer",
-                border_style="blue"
-            ))
+            if not quiet:
+                self._print_start(url)
             
-            # 步骤1: 获取视频信息
-            with Progress(
-                SpinnerColumn(),
-                TextColumn("[progress.description]{task.description}"),
-                console=self.console
-            ) as progress:
+            # 各步骤共用一个进度显示，避免每步重复启动和关闭
+            with self._step_progress(quiet) as progress:
+                # 步骤1: 获取视频信息
                 task = progress.add_task("获取视频信息...", total=None)
-                video_info = self.downloader.get_video_info(url)
+                video_info = self._fetch_video_info(url, video_id)
                 progress.update(task, description="✅ 视频信息获取完成")
-            
-            if not video_info:
-                raise Exception("无法获取视频信息")
-            
-            # 步骤2: 下载视频（可选）
-            video_path = None
-            if download_video:
-                self.downloader.configure_options(
-                    output_path=str(self.video_dir),
-                    format_selector="best[height<=720]",
-                    save_metadata=True
-                )
-                video_path = self.downloader.download_video(url)
-            
-            # 步骤3: 音频提取和转写
-            with Progress(
-                SpinnerColumn(),
-                TextColumn("[progress.description]{task.description}"),
-                console=self.console
-            ) as progress:
-                task = progress.add_task("提取音频并转写...", total=None)
                 
-                # 配置音频解析器
-                self.parser.configure(
-                    audio_output_dir=str(self.audio_dir),
-                    transcript_output_dir=str(self.transcripts_dir)
-                )
-                
-                # 执行转写
-                transcription_result = self.parser.transcribe_from_url(
-                    url, 
-                    save_audio=True,
-                    save_transcript=True
-                )
+                # 步骤2: 下载视频（可选）
+                video_path = self._download_video(url) if download_video else None
                 
+                # 步骤3: 音频提取和转写
+                task = progress.add_task("提取音频并转写...", total=None)
+                transcription_result = self._transcribe(url)
                 progress.update(task, description="✅ 音频转写完成")
-            
-            if not transcription_result:
-                raise Exception("音频转写失败")
-            
-            # 步骤4: 生成分析报告（可选）
-            report_paths = {}
-            if generate_report:
-                with Progress(
-                    SpinnerColumn(),
-                    TextColumn("[progress.description]{task.description}"),
-                    console=self.console
-                ) as progress:
+                
+                # 步骤4: 生成分析报告（可选）
+                report_paths = {}
+                if generate_report:
                     task = progress.add_task("生成分析报告...", total=None)
-                    
-                    # 生成Markdown报告
-                    md_report_path = self.reporter.generate_markdown_report(
-                        video_info,
-                        transcription_result,
-                        str(self.reports_dir / f"{video_info.get('id', 'unknown')}_report.md")
-                    )
-                    
-                    # 生成JSON报告
-                    json_report_path = self.reporter.generate_json_report(
-                        video_info,
-                        transcription_result,
-                        str(self.reports_dir / f"{video_info.get('id', 'unknown')}_data.json")
-                    )
-                    
-                    report_paths = {
-                        'markdown': md_report_path,
-                        'json': json_report_path
-                    }
-                    
+                    report_paths = self._generate_reports(video_id, video_info, transcription_result)
                     progress.update(task, description="✅ 分析报告生成完成")
-                
-                # 显示分析摘要
-                self.reporter.display_summary(video_info, transcription_result)
             
-            # 返回分析结果
-            result = {
-                'success': True,
-                'video_info': video_info,
-                'transcription': transcription_result,
-                'video_path': video_path,
-                'report_paths': report_paths,
-                'output_dir': str(self.output_dir)
+            return self._finish(video_info, transcription_result, video_path,
+                                report_paths, generate_report, quiet)
+            
+        except Exception as e:
+            self.console.print(f"[red]❌ 分析失败: {str(e)}[/]")
+            return {
+                'success': False,
+                'error': str(e)
             }
+    
+    async def analyze_single_video_async(self, url: str, download_video: bool = True,
+                                         generate_report: bool = True, quiet: bool = False,
+                                         force: bool = False) -> dict:
+        """
+        分析单个视频，获取视频信息后，视频下载和音频转写同时进行
+        下载视频主要等待网络，转写主要占用CPU，重叠执行可缩短单个视频的总耗时。
+        下载线程只使用下载器、转写线程只使用解析器，同一模块实例不会被并发使用；
+        同一分析器不要在多个线程中并发调用本方法
+        :param url: 视频URL
+        :param download_video: 是否下载视频文件
+        :param generate_report: 是否生成分析报告
+        :param quiet: 不显示开始/完成面板、步骤进度和分析摘要
+        :param force: 即使已有分析报告也重新分析
+        :return: 分析结果字典
+        """
+        url = douyin.normalize_url(url)
+        video_id = _video_id(url)
+        
+        if not force:
+            cached = self._load_existing_result(video_id)
+            if cached:
+                self.console.print(f"[cyan]⏭️ 已有分析报告，跳过: {url}[/]")
+                return cached
+        
+        try:
+            if not quiet:
+                self._print_start(url)
             
-            self.console.print(Panel(
-                "🎉 视频分析完成！",
-                title="分析完成",
-                border_style="green"
-            ))
+            with self._step_progress(quiet) as progress:
+                async def run_step(description: str, func, *args):
+                    task = progress.add_task(f"{description}...", total=None)
+                    result = await asyncio.to_thread(func, *args)
+                    progress.update(task, description=f"✅ {description}完成")
+                    return result
+                
+                # 先获取视频信息（通常命中缓存），失败时直接返回，不启动下载和转写
+                video_info = await run_step("获取视频信息", self._fetch_video_info, url, video_id)
+                
+                steps = [run_step("提取音频并转写", self._transcribe, url)]
+                if download_video:
+                    steps.append(run_step("下载视频", self._download_video, url))
+                
+                # 线程中的步骤无法取消，等全部结束后再报告第一个错误，返回后不会再有线程写入输出文件
+                outcomes = await asyncio.gather(*steps, return_exceptions=True)
+                for outcome in outcomes:
+                    if isinstance(outcome, BaseException):
+                        raise outcome
+                transcription_result, *rest = outcomes
+                video_path = rest[0] if rest else None
+                
+                report_paths = {}
+                if generate_report:
+                    task = progress.add_task("生成分析报告...", total=None)
+                    report_paths = self._generate_reports(video_id, video_info, transcription_result)
+                    progress.update(task, description="✅ 分析报告生成完成")
             
-            return result
+            return self._finish(video_info, transcription_result, video_path,
+                                report_paths, generate_report, quiet)
             
         except Exception as e:
             self.console.print(f"[red]❌ 分析失败: {str(e)}[/]")
@@ -177,16 +243,188 @@ class BVSAnalyzer:
                 'error': str(e)
             }
     
+    def _print_start(self, url: str):
+        """
+        显示开始分析面板
+        :param url: 视频URL
+        """
+        self.console.print(Panel(
+            f"🎬 开始分析视频: {url}",
+            title="BVS Analyzer",
+            border_style="blue"
+        ))
+    
+    def _step_progress(self, quiet: bool) -> Progress:
+        """
+        创建单个视频各步骤共用的进度显示
+        :param quiet: 是否禁用进度显示
+        :return: Progress对象
+        """
+        return Progress(
+            SpinnerColumn(),
+            TextColumn("[progress.description]{task.description}"),
+            console=self.console,
+            disable=quiet
+        )
+    
+    def _fetch_video_info(self, url: str, video_id: str) -> dict:
+        """
+        获取视频信息，优先使用磁盘缓存
+        :param url: 标准化后的视频URL
+        :param video_id: 视频标识
+        :return: 视频信息字典
+        """
+        video_info = self.meta_cache.get(video_id)
+        if video_info is None:
+            video_info = self.downloader.get_video_info(url)
+            if video_info:
+                self.meta_cache.put(video_id, video_info)
+        
+        if not video_info:
+            raise Exception("无法获取视频信息")
+        return video_info
+    
+    def _download_video(self, url: str) -> Optional[str]:
+        """
+        下载视频文件到输出目录
+        :param url: 标准化后的视频URL
+        :return: 视频文件路径
+        """
+        self.downloader.configure_options(
+            output_path=str(self.video_dir),
+            format_selector="best[height<=720]",
+            save_metadata=True
+        )
+        return self.downloader.download_video(url)
+    
+    def _transcribe(self, url: str) -> dict:
+        """
+        提取音频并转写
+        :param url: 标准化后的视频URL
+        :return: 转写结果
+        """
+        # 配置音频解析器
+        self.parser.configure(
+            audio_output_dir=str(self.audio_dir),
+            transcript_output_dir=str(self.transcripts_dir)
+        )
+        
+        # 执行转写
+        transcription_result = self.parser.transcribe_from_url(
+            url, 
+            save_audio=True,
+            save_transcript=True
+        )
+        
+        if not transcription_result:
+            raise Exception("音频转写失败")
+        return transcription_result
+    
+    def _generate_reports(self, video_id: str, video_info: dict, transcription_result: dict) -> dict:
+        """
+        生成Markdown和JSON分析报告
+        :param video_id: 视频标识，用于报告文件名
+        :param video_info: 视频信息
+        :param transcription_result: 转写结果
+        :return: 报告路径字典
+        """
+        # 生成Markdown报告
+        md_report_path = self.reporter.generate_markdown_report(
+            video_info,
+            transcription_result,
+            str(self.reports_dir / f"{video_id}_report.md")
+        )
+        
+        # 生成JSON报告
+        json_report_path = self.reporter.generate_json_report(
+            video_info,
+            transcription_result,
+            str(self.reports_dir / f"{video_id}_data.json")
+        )
+        
+        return {
+            'markdown': md_report_path,
+            'json': json_report_path
+        }
+    
+    def _finish(self, video_info: dict, transcription_result: dict, video_path: Optional[str],
+                report_paths: dict, generate_report: bool, quiet: bool) -> dict:
+        """
+        显示分析摘要并构造分析结果
+        :return: 分析结果字典
+        """
+        # 显示分析摘要
+        if generate_report and not quiet:
+            self.reporter.display_summary(video_info, transcription_result)
+        
+        # 返回分析结果
+        result = {
+            'success': True,
+            'video_info': video_info,
+            'transcription': transcription_result,
+            'video_path': video_path,
+            'report_paths': report_paths,
+            'output_dir': str(self.output_dir)
+        }
+        
+        if not quiet:
+            self.console.print(Panel(
+                "🎉 视频分析完成！",
+                title="分析完成",
+                border_style="green"
+            ))
+        
+        return result
+    
+    def _load_existing_result(self, video_id: str) -> Optional[dict]:
+        """
+        读取已有的分析报告，构造与新分析一致的结果
+        :param video_id: 视频标识
+        :return: 分析结果字典，报告不完整或无法读取时返回None
+        """
+        md_report_path = self.reports_dir / f"{video_id}_report.md"
+        json_report_path = self.reports_dir / f"{video_id}_data.json"
+        if not md_report_path.exists():
+            return None
+        
+        try:
+            with open(json_report_path, 'r', encoding='utf-8') as f:
+                report_data = json.load(f)
+        except (OSError, ValueError):
+            return None
+        
+        return {
+            'success': True,
+            'cached': True,
+            'video_info': report_data.get('basic_info'),
+            'transcription': report_data.get('transcription'),
+            'video_path': None,
+            'report_paths': {
+                'markdown': str(md_report_path),
+                'json': str(json_report_path)
+            },
+            'output_dir': str(self.output_dir)
+        }
+    
     def analyze_batch_videos(self, urls: List[str], download_video: bool = True,
-                           generate_report: bool = True) -> List[dict]:
+                           generate_report: bool = True, jobs: int = 1,
+                           use_threads: bool = False, force: bool = False) -> List[dict]:
         """
         批量分析多个视频
         :param urls: 视频URL列表
         :param download_video: 是否下载视频文件
         :param generate_report: 是否生成分析报告
-        :return: 分析结果列表
+        :param jobs: 并行任务数，为1时逐个处理
+        :param use_threads: 使用线程池代替进程池，各任务共享当前实例的 Whisper 模型
+        :param force: 即使已有分析报告也重新分析
+        :return: 分析结果列表，顺序与去重后的输入URL一致
         """
-        results = []
+        # 播放列表/频道链接先浅层展开为视频链接，详情在各任务中按需获取
+        urls = [video_url for url in urls
+                for video_url in (self.downloader.list_entries(url) if _is_playlist_url(url) else [url])]
+        
+        # 按视频标识去重，同一视频的不同链接形式只分析一次
+        urls = list({_video_id(douyin.normalize_url(url)): url for url in urls}.values())
         
         self.console.print(Panel(
             f"📋 开始批量分析 {len(urls)} 个视频",
@@ -194,16 +432,66 @@ class BVSAnalyzer:
             border_style="blue"
         ))
         
-        for i, url in enumerate(urls, 1):
-            self.console.print(f"\n[cyan]处理第 {i}/{len(urls)} 个视频[/]")
-            result = self.analyze_single_video(url, download_video, generate_report)
-            results.append(result)
+        results = [None] * len(urls)
+        
+        # 执行器在进度条启动前创建。Whisper 转写受 GIL 限制，默认使用进程池；
+        # 进度条刷新线程和 torch 线程已在运行，fork 出的子进程可能继承被占用的锁而死锁，
+        # 因此用 forkserver/spawn 启动工作进程，由初始化函数在各进程内加载一次模型。
+        # 各进程的模型不再共享内存，主进程不需要模型，不会加载
+        executor = None
+        if jobs > 1:
+            if use_threads:
+                executor = ThreadPoolExecutor(max_workers=jobs)
+                submit = lambda url: executor.submit(
+                    self.analyze_single_video, url, download_video, generate_report, True, force)
+            else:
+                method = 'forkserver' if 'forkserver' in multiprocessing.get_all_start_methods() else 'spawn'
+                # 主进程已加载解析器时沿用其模型参数，否则工作进程使用默认参数
+                parser_args = ()
+                if self._parser is not None:
+                    parser_args = (self._parser.model_size, self._parser.backend, self._parser.vad,
+                                   self._parser.device, self._parser.compute_type)
+                executor = ProcessPoolExecutor(
+                    max_workers=jobs,
+                    mp_context=multiprocessing.get_context(method),
+                    initializer=_init_analyze_worker,
+                    initargs=(str(self.output_dir), self.cache_transcripts) + parser_args
+                )
+                submit = lambda url: executor.submit(
+                    _analyze_worker, url, download_video, generate_report, force)
+        
+        # 整个批次只维护一个进度条，单个视频不再输出各自的面板和步骤进度
+        with Progress(
+            TextColumn("[progress.description]{task.description}"),
+            BarColumn(),
+            MofNCompleteColumn(),
+            TimeRemainingColumn(),
+            console=self.console
+        ) as progress:
+            task = progress.add_task("批量分析", total=len(urls))
             
-            if not result['success']:
-                self.console.print(f"[yellow]⚠️ 第 {i} 个视频分析失败，继续处理下一个[/]")
+            def record(i: int, result: dict):
+                results[i] = result
+                if not result['success']:
+                    progress.console.print(f"[yellow]⚠️ 第 {i + 1} 个视频分析失败: {result['error']}[/]")
+                progress.advance(task)
+            
+            if executor is None:
+                for i, url in enumerate(urls):
+                    record(i, self.analyze_single_video(url, download_video, generate_report,
+                                                       quiet=True, force=force))
+            else:
+                with executor:
+                    futures = {submit(url): i for i, url in enumerate(urls)}
+                    for future in as_completed(futures):
+                        try:
+                            result = future.result()
+                        except Exception as e:
+                            result = {'success': False, 'error': str(e)}
+                        record(futures[future], result)
         
         # 统计结果
-        success_count = sum(1 for r in results if r['success'])
+        success_count = sum(r['success'] for r in results)
         self.console.print(Panel(
             f"✅ 成功: {success_count}/{len(urls)}\n❌ 失败: {len(urls) - success_count}/{len(urls)}",
             title="批量分析完成",
@@ -213,6 +501,32 @@ class BVSAnalyzer:
         return results
 
 
+# 进程池工作进程内的分析器实例，由 _init_analyze_worker 创建
+_worker_analyzer = None
+
+
+def _init_analyze_worker(output_dir: str, cache_transcripts: bool, *parser_args):
+    """
+    进程池初始化函数，限制推理线程数、加载一次模型并创建本进程的分析器
+    :param output_dir: 输出目录
+    :param cache_transcripts: 是否缓存转写结果
+    :param parser_args: 传给 audio_parser._init_worker 的模型参数，为空时使用默认参数
+    """
+    global _worker_analyzer
+    from parser import audio_parser
+    audio_parser._init_worker(*parser_args)
+    _worker_analyzer = BVSAnalyzer(output_dir=output_dir, quiet=True, parser=audio_parser._worker_parser,
+                                   cache_transcripts=cache_transcripts)
+
+
+def _analyze_worker(url: str, download_video: bool, generate_report: bool, force: bool = False) -> dict:
+    """
+    进程池工作函数，使用本进程的分析器分析单个视频
+    """
+    return _worker_analyzer.analyze_single_video(url, download_video, generate_report,
+                                                 quiet=True, force=force)
+
+
 def main():
     """
     主函数，处理命令行参数并执行分析
@@ -258,6 +572,29 @@ def main():
         action="store_true",
         help="不生成分析报告"
     )
+    parser.add_argument(
+        "--force",
+        action="store_true",
+        help="忽略已有的分析报告，重新分析"
+    )
+    parser.add_argument(
+        "--cache-transcripts",
+        action="store_true",
+        help="将转写结果缓存到输出目录的 .transcript_cache 下，重复分析同一音频时直接读取"
+    )
+    
+    # 并行选项
+    parser.add_argument(
+        "-j", "--jobs",
+        type=int,
+        default=max(1, (os.cpu_count() or 2) // 2),
+        help="批量分析时的并行任务数（默认: CPU核数的一半）"
+    )
+    parser.add_argument(
+        "--threads",
+        action="store_true",
+        help="批量分析时使用线程池并共享同一个 Whisper 模型（适合 --no-download）"
+    )
     
     # 解析参数
     args = parser.parse_args()
@@ -282,16 +619,18 @@ def main():
         sys.exit(1)
     
     # 创建分析器并执行分析
-    analyzer = BVSAnalyzer(output_dir=args.output)
+    analyzer = BVSAnalyzer(output_dir=args.output, cache_transcripts=args.cache_transcripts)
     
     try:
-        if len(urls) == 1:
+        if len(urls) == 1 and not _is_playlist_url(urls[0]):
             # 单个视频分析
-            result = analyzer.analyze_single_video(
+            # 单个视频时信息获取、下载和转写重叠执行
+            result = asyncio.run(analyzer.analyze_single_video_async(
                 urls[0],
                 download_video=not args.no_download,
-                generate_report=not args.no_report
-            )
+                generate_report=not args.no_report,
+                force=args.force
+            ))
             
             if not result['success']:
                 sys.exit(1)
@@ -300,7 +639,10 @@ def main():
             results = analyzer.analyze_batch_videos(
                 urls,
                 download_video=not args.no_download,
-                generate_report=not args.no_report
+                generate_report=not args.no_report,
+                jobs=args.jobs,
+                use_threads=args.threads,
+                force=args.force
             )
             
             # 检查是否有失败的分析
@@ -313,6 +655,9 @@ def main():
     except Exception as e:
         print(f"程序执行出错: {str(e)}")
         sys.exit(1)
+    finally:
+        # 释放下载器复用的 YoutubeDL 实例
+        analyzer.downloader.close()
 
 
 if __name__ == "__main__":
@@ -6,98 +6,92 @@
 """
 
 import sys
+from importlib.util import find_spec
 from pathlib import Path
 
+# 模块可用性探测结果，同一进程内每个模块只探测一次
+_PROBE_CACHE = {}
+
+def _available(name):
+    """只通过查找器判断模块是否可用，不执行模块代码"""
+    if name not in _PROBE_CACHE:
+        parent, _, _ = name.rpartition('.')
+        if parent and not _available(parent):
+            # 父包不可用时子模块必然不可用，无需再查找
+            _PROBE_CACHE[name] = False
+        else:
+            try:
+                _PROBE_CACHE[name] = find_spec(name) is not None
+            except (ImportError, ValueError):
+                _PROBE_CACHE[name] = False
+    return _PROBE_CACHE[name]
+
+def _probe(specs):
+    """
+    按 (模块名, 说明) 列表探测模块并输出结果
+    :param specs: (模块名, 说明) 元组列表，说明可为空字符串
+    :return: (模块名, 是否可用) 元组列表
+    """
+    results = []
+    for name, desc in specs:
+        label = f"{name} ({desc})" if desc else name
+        ok = _available(name)
+        print(f"  ✅ {label}" if ok else f"  ❌ {label}: 未找到")
+        results.append((name, ok))
+    return results
+
 def test_standard_library():
     """测试标准库导入"""
     print("📚 标准库导入测试")
     
-    modules = [
-        'os', 'sys', 'json', 'pathlib', 'argparse',
-        'tempfile', 'subprocess', 'datetime', 'typing'
-    ]
-    
-    failed = []
-    for module in modules:
-        try:
-            __import__(module)
-            print(f"  ✅ {module}")
-        except ImportError as e:
-            print(f"  ❌ {module}: {e}")
-            failed.append(module)
+    results = _probe([
+        ('os', ''), ('sys', ''), ('json', ''), ('pathlib', ''), ('argparse', ''),
+        ('tempfile', ''), ('subprocess', ''), ('datetime', ''), ('typing', '')
+    ])
     
-    return len(failed) == 0
+    return all(ok for _, ok in results)
 
 def test_third_party_basic():
     """测试基础第三方库"""
     print("\n📦 基础第三方库测试")
     
-    modules = [
+    results = _probe([
         ('requests', 'HTTP请求库'),
         ('rich', 'Rich终端库'),
         ('pathlib', '路径处理')
-    ]
-    
-    failed = []
-    for module, desc in modules:
-        try:
-            __import__(module)
-            print(f"  ✅ {module} ({desc})")
-        except ImportError as e:
-            print(f"  ❌ {module} ({desc}): {e}")
-            failed.append(module)
+    ])
     
-    return len(failed) == 0
+    return all(ok for _, ok in results)
 
 def test_rich_components():
     """测试Rich组件"""
     print("\n🎨 Rich组件测试")
     
-    components = [
-        'rich.console',
-        'rich.panel', 
-        'rich.progress',
-        'rich.table'
-    ]
-    
-    failed = []
-    for component in components:
-        try:
-            __import__(component)
-            print(f"  ✅ {component}")
-        except ImportError as e:
-            print(f"  ❌ {component}: {e}")
-            failed.append(component)
+    results = _probe([
+        ('rich.console', ''),
+        ('rich.panel', ''),
+        ('rich.progress', ''),
+        ('rich.table', '')
+    ])
     
-    return len(failed) == 0
+    return all(ok for _, ok in results)
 
 def test_video_processing():
     """测试视频处理相关库"""
     print("\n🎬 视频处理库测试")
     
-    modules = [
+    results = _probe([
         ('yt_dlp', '视频下载库'),
         ('ffmpeg', 'FFmpeg Python绑定'),
         ('whisper', 'OpenAI Whisper语音识别')
-    ]
-    
-    available = []
-    failed = []
-    
-    for module, desc in modules:
-        try:
-            __import__(module)
-            print(f"  ✅ {module} ({desc})")
-            available.append(module)
-        except ImportError as e:
-            print(f"  ❌ {module} ({desc}): {e}")
-            failed.append(module)
+    ])
     
+    failed = [name for name, ok in results if not ok]
     if failed:
         print(f"\n  ⚠️ 缺失的视频处理库: {failed}")
         print("  💡 请运行: pip install yt-dlp openai-whisper ffmpeg-python")
     
-    return len(available) > 0  # 至少有一个可用即可
+    return len(failed) < len(results)  # 至少有一个可用即可
 
 def test_custom_modules():
     """测试自定义模块导入"""
@@ -1,11 +1,25 @@
 import os
-import json
+import sys
+import wave
+import queue
+import bisect
+import hashlib
+import shutil
+import tempfile
+import functools
+import multiprocessing
+import subprocess
+import threading
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor, as_completed, wait
 from pathlib import Path
 from typing import Dict, List, Optional
-import whisper
-import ffmpeg
 from rich.console import Console
 from rich.progress import Progress, SpinnerColumn, TextColumn
+from utils.jsonio import read_json, write_json
+
+
+# 书写时词与词之间不加空格的语言，拼接分段文本时直接相连
+_CJK_LANGUAGES = frozenset(('zh', 'ja', 'ko', 'yue'))
 
 
 class AudioParser:
@@ -13,25 +27,96 @@ class AudioParser:
     音频解析器，负责从视频中提取音频并进行语音转写
     """
     
-    def __init__(self, console: Console = None, model_size: str = "base"):
+    # ONNX Runtime 后端使用的预量化 int8 模型
+    ORT_MODEL_ID = "Intel/whisper-{size}-int8-static-inc"
+    
+    # VAD 参数：采样率、帧长（毫秒）、合并的最大静音间隔与语音前后保留（秒）
+    VAD_SAMPLE_RATE = 16000
+    VAD_FRAME_MS = 30
+    VAD_MERGE_GAP = 0.3
+    VAD_PADDING = 0.2
+    
+    # 流式转写：每次从 ffmpeg 读取的时长，以及在窗口末尾搜索静音切分点的范围（秒）
+    STREAM_BLOCK_SEC = 5
+    STREAM_SEARCH_SEC = 5
+    
+    # 转写缓存的格式版本，结果结构或解码逻辑变化时递增，使旧缓存失效
+    TRANSCRIPT_CACHE_VERSION = 1
+    
+    # 保证同一模型只加载一次，避免并发创建解析器时重复加载
+    _model_cache_lock = threading.Lock()
+    
+    def __init__(self, console: Console = None, model_size: str = "tiny", backend: str = None,
+                 vad: bool = True, device: str = None, compute_type: str = None, cache_dir: str = None):
         """
         初始化音频解析器
         :param console: Rich Console对象
-        :param model_size: Whisper模型大小 (tiny, base, small, medium, large)
+        :param model_size: Whisper模型大小 (tiny, base, small, medium, large)，默认 tiny 以提高CPU上的速度
+        :param backend: 推理后端，"ort" 使用 ONNX Runtime int8 模型（需安装 optimum[onnxruntime] 和 librosa），
+                        为None时自动选择 faster-whisper 或 openai-whisper
+        :param vad: 转写前用语音活动检测跳过静音片段
+        :param device: 推理设备 (cuda, cpu)，为None时有 GPU 则用 cuda
+        :param compute_type: faster-whisper 的计算精度 (float16, int8_float16, int8 等)，为None时按设备选择
+        :param cache_dir: 转写结果的缓存目录，同一段音频以相同选项再次转写时直接读取，为None时不缓存
         """
         self.console = console or Console()
         self.model_size = model_size
+        self.vad = vad
+        self.device = device
+        self.compute_type = compute_type
+        self.cache_dir = Path(cache_dir) if cache_dir else None
         self.model = None
+        # 实际使用的推理后端: faster_whisper、whisper 或 ort
+        self.backend = backend
+        # ONNX Runtime 后端的处理器和语音识别管道
+        self.processor = None
+        self._ort_pipeline = None
+        # 与模型一同缓存的锁：Whisper 解码时会在模型上挂载缓存钩子，同一模型不能被多个线程同时使用
+        self._model_lock = None
         self.audio_output_dir = None
         self.transcript_output_dir = None
+        # 写结果文件用的线程池，按需创建；记录创建时的进程号，fork 出的子进程需要重新创建
+        self._io_pool = None
+        self._io_pool_pid = None
         self._load_whisper_model()
     
-    def configure(self, audio_output_dir: str = None, transcript_output_dir: str = None):
+    def _get_io_pool(self) -> ThreadPoolExecutor:
+        """
+        获取本进程的文件写入线程池
+        """
+        if self._io_pool is None or self._io_pool_pid != os.getpid():
+            self._io_pool = ThreadPoolExecutor(max_workers=4)
+            self._io_pool_pid = os.getpid()
+        return self._io_pool
+    
+    def _write_transcript_json(self, transcription: Dict, transcript_path: str):
         """
-        配置输出目录
+        保存转写结果为 JSON 文件
+        :param transcription: 转写结果
+        :param transcript_path: 保存路径
+        """
+        write_json(transcript_path, transcription)
+    
+    def configure(self, audio_output_dir: str = None, transcript_output_dir: str = None,
+                  model_size: str = None, backend: str = None, device: str = None,
+                  compute_type: str = None):
+        """
+        配置输出目录，以及切换模型大小、推理后端和设备；模型相关参数与当前不同时重新加载模型
         :param audio_output_dir: 音频输出目录
         :param transcript_output_dir: 转写文本输出目录
+        :param model_size: Whisper模型大小
+        :param backend: 推理后端 (faster_whisper, whisper, ort)
+        :param device: 推理设备 (cuda, cpu)
+        :param compute_type: faster-whisper 的计算精度 (float16, int8_float16, int8 等)
         """
+        model_options = {'model_size': model_size, 'backend': backend,
+                         'device': device, 'compute_type': compute_type}
+        changed = {name: value for name, value in model_options.items()
+                   if value and value != getattr(self, name)}
+        if changed:
+            # 加载成功后才更新各项模型参数，加载失败时保持原模型和参数不变
+            self._load_whisper_model(**changed)
+        
         if audio_output_dir:
             self.audio_output_dir = Path(audio_output_dir)
             self.audio_output_dir.mkdir(parents=True, exist_ok=True)
@@ -40,17 +125,93 @@ class AudioParser:
             self.transcript_output_dir = Path(transcript_output_dir)
             self.transcript_output_dir.mkdir(parents=True, exist_ok=True)
     
-    def _load_whisper_model(self):
+    def _load_whisper_model(self, **overrides):
         """
-        加载 Whisper 模型
+        加载 Whisper 模型，同一进程内相同大小和后端的模型只加载一次
+        加载成功后才写回模型参数，失败时解析器保持原来的模型和参数
+        :param overrides: 要切换的模型参数 (model_size, backend, device, compute_type)，未给出的沿用当前值
         """
+        options = {'model_size': self.model_size, 'backend': self.backend,
+                   'device': self.device, 'compute_type': self.compute_type}
+        options.update(overrides)
         try:
-            self.console.print(f"[cyan]🤖 正在加载 Whisper {self.model_size} 模型...[/]")
-            self.model = whisper.load_model(self.model_size)
-            self.console.print(f"[green]✅ Whisper 模型加载成功[/]")
+            self.console.print(f"[cyan]🤖 正在加载 Whisper {options['model_size']} 模型...[/]")
+            with AudioParser._model_cache_lock:
+                backend, model, processor, ort_pipeline, model_lock = AudioParser._get_model(
+                    options['model_size'], options['backend'], options['device'], options['compute_type'])
         except Exception as e:
             self.console.print(f"[red]❌ Whisper 模型加载失败: {str(e)}[/]")
             raise e
+        
+        self.model_size = options['model_size']
+        self.device = options['device']
+        self.compute_type = options['compute_type']
+        (self.backend, self.model, self.processor,
+         self._ort_pipeline, self._model_lock) = backend, model, processor, ort_pipeline, model_lock
+        self.console.print(f"[green]✅ Whisper 模型加载成功 ({self.backend})[/]")
+    
+    @staticmethod
+    @functools.lru_cache(maxsize=4)
+    def _get_model(model_size: str, backend: Optional[str], device: Optional[str] = None,
+                   compute_type: Optional[str] = None) -> tuple:
+        """
+        加载模型并按 (模型大小, 后端, 设备, 计算精度) 缓存在类上
+        未指定后端时优先使用 faster-whisper（CTranslate2 int8 推理），未安装时回退到 openai-whisper
+        :param model_size: Whisper模型大小
+        :param backend: 指定的推理后端 (faster_whisper, whisper, ort)，为None时自动选择
+        :param device: 推理设备，为None时有 GPU 则用 cuda
+        :param compute_type: faster-whisper 的计算精度，为None时按设备选择；openai-whisper 在 GPU 上固定用 FP16
+        :return: (后端名, 模型, ORT处理器, ORT管道, 模型锁)
+        """
+        if backend == 'ort':
+            return ('ort',) + AudioParser._load_ort_model(model_size) + (threading.Lock(),)
+        
+        if backend != 'whisper':
+            try:
+                from faster_whisper import WhisperModel
+                import ctranslate2
+            except ImportError:
+                # 显式指定 faster-whisper 时不回退
+                if backend == 'faster_whisper':
+                    raise
+                backend = 'whisper'
+        
+        if backend == 'whisper':
+            # whisper 会连带导入 torch，耗时较长，仅在真正加载模型时导入
+            import whisper
+            import torch
+            device = device or ("cuda" if torch.cuda.is_available() else "cpu")
+            return 'whisper', whisper.load_model(model_size, device=device), None, None, threading.Lock()
+        
+        if device is None:
+            device = "cuda" if ctranslate2.get_cuda_device_count() > 0 else "cpu"
+        # GPU 上默认使用 int8 权重 + FP16 计算，兼顾显存带宽与精度
+        if compute_type is None:
+            compute_type = "int8_float16" if device == "cuda" else "int8"
+        model = WhisperModel(model_size, device=device, compute_type=compute_type)
+        return 'faster_whisper', model, None, None, threading.Lock()
+    
+    @staticmethod
+    def _load_ort_model(model_size: str) -> tuple:
+        """
+        加载 ONNX Runtime 上的 int8 量化 Whisper 模型，并构建带时间戳的识别管道
+        :param model_size: Whisper模型大小
+        :return: (模型, 处理器, 识别管道)
+        """
+        from optimum.onnxruntime import ORTModelForSpeechSeq2Seq
+        from transformers import WhisperProcessor, pipeline
+        
+        model_id = AudioParser.ORT_MODEL_ID.format(size=model_size)
+        model = ORTModelForSpeechSeq2Seq.from_pretrained(model_id, provider="CPUExecutionProvider")
+        processor = WhisperProcessor.from_pretrained(model_id)
+        ort_pipeline = pipeline(
+            "automatic-speech-recognition",
+            model=model,
+            tokenizer=processor.tokenizer,
+            feature_extractor=processor.feature_extractor,
+            chunk_length_s=30
+        )
+        return model, processor, ort_pipeline
     
     def extract_audio_from_video(self, video_path: str, audio_path: str = None) -> str:
         """
@@ -59,6 +220,8 @@ class AudioParser:
         :param audio_path: 音频输出路径，如果为None则自动生成
         :return: 音频文件路径
         """
+        import ffmpeg
+        
         video_path = Path(video_path)
         
         if audio_path is None:
@@ -85,41 +248,261 @@ class AudioParser:
             self.console.print(f"[red]❌ 音频提取失败: {str(e)}[/]")
             raise e
     
-    def transcribe_audio(self, audio_path: str, language: str = "zh") -> Dict:
+    def extract_audio_ndarray(self, video_path: str):
+        """
+        从视频中提取音频，通过管道直接读入内存，不写中间 WAV 文件
+        :param video_path: 视频文件路径
+        :return: 16kHz 单声道 float32 音频数组，可直接传给 transcribe_audio
+        """
+        video_path = Path(video_path)
+        try:
+            self.console.print(f"[cyan]🎵 正在提取音频: {video_path.name}[/]")
+            
+            audio = self._decode_audio(str(video_path))
+            
+            self.console.print(f"[green]✅ 音频提取完成: {len(audio) / self.VAD_SAMPLE_RATE:.1f}秒[/]")
+            return audio
+            
+        except Exception as e:
+            self.console.print(f"[red]❌ 音频提取失败: {str(e)}[/]")
+            raise e
+    
+    def _decode_audio(self, source: str, headers: Dict = None):
+        """
+        用 ffmpeg 解码音频并通过管道读入内存
+        :param source: 本地文件路径或音视频流地址
+        :param headers: 读取流地址时附带的 HTTP 请求头
+        :return: 16kHz 单声道 float32 音频数组
+        """
+        import numpy as np
+        
+        command = ["ffmpeg", "-nostdin"]
+        if headers:
+            command += ["-headers", "".join(f"{key}: {value}\r\n" for key, value in headers.items())]
+        command += ["-i", source, "-f", "s16le", "-ac", "1", "-ar", str(self.VAD_SAMPLE_RATE), "-"]
+        
+        result = subprocess.run(command, stdout=subprocess.PIPE, stderr=subprocess.DEVNULL, check=True)
+        return np.frombuffer(result.stdout, dtype=np.int16).astype(np.float32) / 32768.0
+    
+    def _stream_chunks(self, video_path: str, block_sec: int = STREAM_BLOCK_SEC, audio_path: str = None):
+        """
+        边解码边读取 ffmpeg 输出的 PCM 数据，按固定时长分块读取
+        :param video_path: 视频文件路径
+        :param block_sec: 每次读取的时长（秒）
+        :param audio_path: 同时把解码出的音频写入该 WAV 文件，为None时不保存
+        :return: 生成器，依次产出 16kHz 单声道 float32 音频块
+        """
+        import numpy as np
+        
+        block_size = block_sec * self.VAD_SAMPLE_RATE * 2
+        process = subprocess.Popen(
+            ["ffmpeg", "-nostdin", "-i", str(video_path),
+             "-f", "s16le", "-ac", "1", "-ar", str(self.VAD_SAMPLE_RATE), "-"],
+            stdout=subprocess.PIPE,
+            stderr=subprocess.DEVNULL
+        )
+        wav = None
+        try:
+            if audio_path is not None:
+                wav = wave.open(str(audio_path), 'wb')
+                wav.setnchannels(1)
+                wav.setsampwidth(2)
+                wav.setframerate(self.VAD_SAMPLE_RATE)
+            while True:
+                data = process.stdout.read(block_size)
+                if not data:
+                    break
+                # 丢弃末尾不足一个采样点的字节
+                data = data[:len(data) - len(data) % 2]
+                if wav is not None:
+                    wav.writeframesraw(data)
+                yield np.frombuffer(data, dtype=np.int16).astype(np.float32) / 32768.0
+        finally:
+            if wav is not None:
+                wav.close()
+            process.stdout.close()
+            if process.wait() != 0:
+                raise RuntimeError(f"ffmpeg 解码失败，退出码 {process.returncode}")
+    
+    def _silence_cut(self, audio, search_start: int) -> int:
+        """
+        在 audio[search_start:] 范围内找能量最低的一帧作为切分点，避免把一个词或一句话切成两半
+        :param audio: 16kHz 单声道 float32 音频
+        :param search_start: 开始搜索的采样点
+        :return: 切分位置（采样点）
+        """
+        import numpy as np
+        
+        frame_len = self.VAD_SAMPLE_RATE * self.VAD_FRAME_MS // 1000
+        n_frames = (len(audio) - search_start) // frame_len
+        if n_frames <= 0:
+            return len(audio)
+        tail = audio[search_start:search_start + n_frames * frame_len]
+        energy = np.square(tail).reshape(n_frames, frame_len).mean(axis=1)
+        return search_start + int(np.argmin(energy)) * frame_len + frame_len // 2
+    
+    def transcribe_video_streaming(self, video_path: str, language: str = "zh",
+                                   chunk_sec: int = 30, word_timestamps: bool = False,
+                                   audio_path: str = None) -> Dict:
+        """
+        解码与转写流水线并行：后台线程从 ffmpeg 读取音频，当前线程按窗口逐段转写
+        窗口在末尾 STREAM_SEARCH_SEC 秒内能量最低处切分，剩余部分并入下一个窗口，不在词句中间切断
+        :param video_path: 视频文件路径
+        :param language: 语言代码 (zh, en, etc.)
+        :param chunk_sec: 每个转写窗口的最大时长（秒）
+        :param word_timestamps: 是否输出逐词时间戳，见 transcribe_audio
+        :param audio_path: 同时把解码出的音频保存为该 WAV 文件，为None时音频不落盘
+        :return: 转写结果字典，格式与 transcribe_audio 相同
+        """
+        import numpy as np
+        
+        video_name = Path(video_path).name
+        cache_path = (self._transcript_cache_path(video_path, language, word_timestamps, 'stream', chunk_sec, self.STREAM_SEARCH_SEC)
+                      if self.cache_dir else None)
+        if cache_path is not None and cache_path.exists():
+            try:
+                transcription_result = read_json(cache_path)
+                self.console.print(f"[green]♻️ 使用缓存的转写结果: {video_name}[/]")
+                # 命中缓存时不会解码，需要音频文件时单独提取
+                if audio_path is not None and not Path(audio_path).exists():
+                    self.extract_audio_from_video(video_path, audio_path)
+                return transcription_result
+            except (OSError, ValueError):
+                pass
+        
+        chunks = queue.Queue(maxsize=4)
+        done = object()
+        stop = threading.Event()
+        errors = []
+        
+        def produce():
+            try:
+                for chunk in self._stream_chunks(video_path, audio_path=audio_path):
+                    if stop.is_set():
+                        break
+                    chunks.put(chunk)
+            except Exception as e:
+                errors.append(e)
+            finally:
+                chunks.put(done)
+        
+        self.console.print(f"[cyan]📝 正在边解码边转写: {video_name}[/]")
+        producer = threading.Thread(target=produce, daemon=True)
+        producer.start()
+        
+        rate = self.VAD_SAMPLE_RATE
+        window = chunk_sec * rate
+        search = min(self.STREAM_SEARCH_SEC * rate, window // 2)
+        texts = []
+        segments = []
+        detected_language = language
+        
+        def transcribe_window(audio, offset: float):
+            nonlocal detected_language
+            with self._model_lock:
+                if self.backend == 'faster_whisper':
+                    text, detected_language, window_segments = self._transcribe_faster_whisper(audio, language, word_timestamps)
+                elif self.backend == 'ort':
+                    text, detected_language, window_segments = self._transcribe_ort(audio, language, word_timestamps)
+                else:
+                    text, detected_language, window_segments = self._transcribe_openai_whisper(audio, language, word_timestamps)
+            
+            # 片段时间加上本窗口在整段音频中的起始时间
+            if text.strip():
+                texts.append(text.strip())
+            for segment in window_segments:
+                segment['start'] += offset
+                segment['end'] += offset
+                if word_timestamps:
+                    segment['words'] = [dict(w, start=w['start'] + offset, end=w['end'] + offset)
+                                        for w in segment['words']]
+                segments.append(segment)
+        
+        buffer = np.zeros(0, dtype=np.float32)
+        consumed = 0
+        try:
+            while True:
+                chunk = chunks.get()
+                if chunk is done:
+                    break
+                buffer = np.concatenate((buffer, chunk))
+                while len(buffer) >= window:
+                    cut = self._silence_cut(buffer[:window], window - search)
+                    transcribe_window(buffer[:cut], consumed / rate)
+                    consumed += cut
+                    buffer = buffer[cut:]
+            if len(buffer):
+                transcribe_window(buffer, consumed / rate)
+        except BaseException:
+            # 转写出错时通知后台线程停止，并清空队列使其不会阻塞在 put 上
+            stop.set()
+            while producer.is_alive():
+                try:
+                    chunks.get(timeout=0.1)
+                except queue.Empty:
+                    pass
+            raise
+        
+        producer.join()
+        if errors:
+            self.console.print(f"[red]❌ 音频转写失败: {str(errors[0])}[/]")
+            raise errors[0]
+        
+        # 中日韩文字之间不加空格，其他语言用空格连接各窗口的文本，避免相邻单词粘连
+        separator = '' if detected_language in _CJK_LANGUAGES else ' '
+        transcription_result = {
+            'text': separator.join(texts),
+            'language': detected_language,
+            'segments': segments,
+            'duration': segments[-1]['end'] if segments else 0
+        }
+        if cache_path is not None:
+            self._save_transcript_cache(cache_path, transcription_result)
+        
+        self.console.print(f"[green]✅ 音频转写完成，共 {len(segments)} 个片段[/]")
+        return transcription_result
+    
+    def transcribe_audio(self, audio_path, language: str = "zh", word_timestamps: bool = False) -> Dict:
         """
         使用 Whisper 转写音频为文本
-        :param audio_path: 音频文件路径
+        :param audio_path: 音频文件路径，或 extract_audio_ndarray 返回的 16kHz 单声道音频数组
         :param language: 语言代码 (zh, en, etc.)
+        :param word_timestamps: 是否输出逐词时间戳（片段的 words 字段），需要额外的对齐计算，报告只用到片段级时间戳，默认关闭
         :return: 转写结果字典
         """
         try:
-            self.console.print(f"[cyan]📝 正在转写音频: {Path(audio_path).name}[/]")
+            audio_name = Path(audio_path).name if isinstance(audio_path, (str, os.PathLike)) else "内存音频"
             
-            # 使用 Whisper 进行转写
-            result = self.model.transcribe(
-                audio_path,
-                language=language,
-                word_timestamps=True,
-                verbose=False
-            )
+            cache_path = self._transcript_cache_path(audio_path, language, word_timestamps) if self.cache_dir else None
+            if cache_path is not None and cache_path.exists():
+                try:
+                    transcription_result = read_json(cache_path)
+                    self.console.print(f"[green]♻️ 使用缓存的转写结果: {audio_name}[/]")
+                    return transcription_result
+                except (OSError, ValueError):
+                    pass
             
-            # 处理转写结果
-            segments = []
-            for segment in result['segments']:
-                segments.append({
-                    'start': segment['start'],
-                    'end': segment['end'],
-                    'text': segment['text'].strip(),
-                    'words': segment.get('words', [])
-                })
+            self.console.print(f"[cyan]📝 正在转写音频: {audio_name}[/]")
+            
+            # 使用 Whisper 进行转写
+            with self._model_lock:
+                if self.backend == 'faster_whisper':
+                    text, detected_language, segments = self._transcribe_faster_whisper(audio_path, language, word_timestamps)
+                elif self.backend == 'ort':
+                    text, detected_language, segments = self._transcribe_ort(audio_path, language, word_timestamps)
+                else:
+                    text, detected_language, segments = self._transcribe_openai_whisper(audio_path, language, word_timestamps)
             
             transcription_result = {
-                'text': result['text'].strip(),
-                'language': result['language'],
+                'text': text,
+                'language': detected_language,
                 'segments': segments,
                 'duration': segments[-1]['end'] if segments else 0
             }
             
+            if cache_path is not None:
+                self._save_transcript_cache(cache_path, transcription_result)
+            
             self.console.print(f"[green]✅ 音频转写完成，共 {len(segments)} 个片段[/]")
             return transcription_result
             
@@ -127,6 +510,207 @@ class AudioParser:
             self.console.print(f"[red]❌ 音频转写失败: {str(e)}[/]")
             raise e
     
+    def _transcript_cache_path(self, audio_path, language: str, word_timestamps: bool, *extra) -> Path:
+        """
+        计算转写结果的缓存路径：音频内容的 SHA-256 加上所有影响结果的解码选项
+        :param audio_path: 音频文件路径或音频数组
+        :param language: 语言代码
+        :param word_timestamps: 是否输出逐词时间戳
+        :param extra: 其他影响结果的选项（如流式转写的窗口长度）
+        :return: 缓存文件路径
+        """
+        digest = hashlib.sha256()
+        if isinstance(audio_path, (str, os.PathLike)):
+            # 分块读取，避免大文件整个读入内存
+            with open(audio_path, 'rb') as f:
+                for block in iter(functools.partial(f.read, 1 << 20), b''):
+                    digest.update(block)
+        else:
+            digest.update(memoryview(audio_path).cast('B'))
+        
+        # 所有影响解码结果的选项都计入缓存键
+        options = (self.TRANSCRIPT_CACHE_VERSION, self.backend, self.model_size, self.device,
+                   self.compute_type, language, word_timestamps, self.vad,
+                   self.VAD_SAMPLE_RATE, self.VAD_FRAME_MS, self.VAD_MERGE_GAP, self.VAD_PADDING) + extra
+        digest.update(repr(options).encode('utf-8'))
+        return self.cache_dir / f"{digest.hexdigest()}.json"
+    
+    def _save_transcript_cache(self, cache_path: Path, transcription: Dict):
+        """
+        写入转写缓存，失败时只提示不影响转写结果
+        :param cache_path: 缓存文件路径
+        :param transcription: 转写结果
+        """
+        try:
+            cache_path.parent.mkdir(parents=True, exist_ok=True)
+            # 先写临时文件再替换，避免并行任务读到写了一半的文件
+            tmp_path = cache_path.with_name(f"{cache_path.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+            write_json(tmp_path, transcription, indent=False)
+            os.replace(tmp_path, cache_path)
+        except OSError as e:
+            self.console.print(f"[yellow]⚠️ 转写缓存写入失败: {str(e)}[/]")
+    
+    def _transcribe_faster_whisper(self, audio_path, language: str, word_timestamps: bool = False):
+        """
+        使用 faster-whisper 转写
+        :return: (全文, 识别语言, 片段列表)
+        """
+        segments_iter, info = self.model.transcribe(
+            audio_path,
+            language=language,
+            word_timestamps=word_timestamps,
+            vad_filter=self.vad
+        )
+        
+        # segments_iter 是生成器，迭代时才真正解码
+        texts = []
+        segments = []
+        for segment in segments_iter:
+            texts.append(segment.text)
+            item = {
+                'start': segment.start,
+                'end': segment.end,
+                'text': segment.text.strip()
+            }
+            if word_timestamps:
+                item['words'] = [
+                    {'word': w.word, 'start': w.start, 'end': w.end, 'probability': w.probability}
+                    for w in (segment.words or [])
+                ]
+            segments.append(item)
+        return ''.join(texts).strip(), info.language, segments
+    
+    def _transcribe_ort(self, audio_path, language: str, word_timestamps: bool = False):
+        """
+        使用 ONNX Runtime 管道转写，输出片段级时间戳（不支持逐词时间戳，words 始终为空）
+        :return: (全文, 识别语言, 片段列表)
+        """
+        if isinstance(audio_path, (str, os.PathLike)):
+            import librosa
+            audio, sampling_rate = librosa.load(os.fspath(audio_path), sr=16000)
+        else:
+            audio, sampling_rate = audio_path, 16000
+        result = self._ort_pipeline(
+            {'raw': audio, 'sampling_rate': sampling_rate},
+            return_timestamps=True,
+            generate_kwargs={'language': language, 'task': 'transcribe'}
+        )
+        
+        segments = []
+        for chunk in result.get('chunks', []):
+            start, end = chunk['timestamp']
+            item = {
+                'start': start,
+                # 最后一个片段可能没有结束时间
+                'end': end if end is not None else start,
+                'text': chunk['text'].strip()
+            }
+            if word_timestamps:
+                item['words'] = []
+            segments.append(item)
+        return result['text'].strip(), language, segments
+    
+    def _transcribe_openai_whisper(self, audio_path, language: str, word_timestamps: bool = False):
+        """
+        使用 openai-whisper 转写
+        :return: (全文, 识别语言, 片段列表)
+        """
+        # openai-whisper 只把 str 当作文件路径，Path 需先转换
+        is_path = isinstance(audio_path, (str, os.PathLike))
+        audio = os.fspath(audio_path) if is_path else audio_path
+        intervals = None
+        if self.vad:
+            import whisper
+            import numpy as np
+            
+            if is_path:
+                waveform = whisper.load_audio(audio, sr=self.VAD_SAMPLE_RATE)
+            else:
+                waveform = audio_path
+            intervals = self._speech_intervals(waveform)
+            if intervals:
+                # 只把语音片段拼接后送入模型
+                audio = np.concatenate([waveform[start:end] for start, end in intervals])
+        
+        result = self.model.transcribe(
+            audio,
+            language=language,
+            word_timestamps=word_timestamps,
+            verbose=False,
+            # GPU 上用 FP16 推理，CPU 不支持 FP16 需显式关闭以免告警
+            fp16=self.model.device.type == "cuda"
+        )
+        
+        # 时间戳映射回原始音频的时间轴
+        to_original = self._make_time_mapper(intervals) if intervals else (lambda t: t)
+        
+        # 处理转写结果
+        segments = []
+        for segment in result['segments']:
+            item = {
+                'start': to_original(segment['start']),
+                'end': to_original(segment['end']),
+                'text': segment['text'].strip()
+            }
+            if word_timestamps:
+                item['words'] = [dict(w, start=to_original(w['start']), end=to_original(w['end']))
+                                 for w in segment.get('words', [])]
+            segments.append(item)
+        return result['text'].strip(), result['language'], segments
+    
+    def _speech_intervals(self, waveform) -> Optional[List]:
+        """
+        使用 webrtcvad 检测语音区间
+        :param waveform: 16kHz 单声道 float32 音频
+        :return: [(起始采样点, 结束采样点)] 列表，未安装 webrtcvad 时返回None
+        """
+        try:
+            import webrtcvad
+        except ImportError:
+            return None
+        
+        import numpy as np
+        
+        vad = webrtcvad.Vad(2)
+        rate = self.VAD_SAMPLE_RATE
+        frame_len = rate * self.VAD_FRAME_MS // 1000
+        pcm = (np.clip(waveform, -1.0, 1.0) * 32767).astype(np.int16).tobytes()
+        merge_gap = int(self.VAD_MERGE_GAP * rate)
+        padding = int(self.VAD_PADDING * rate)
+        
+        intervals = []
+        for start in range(0, len(waveform) - frame_len + 1, frame_len):
+            frame = pcm[start * 2:(start + frame_len) * 2]
+            if not vad.is_speech(frame, rate):
+                continue
+            begin, end = max(0, start - padding), min(len(waveform), start + frame_len + padding)
+            # 与上一段间隔很短时合并，避免把连续的话切碎
+            if intervals and begin - intervals[-1][1] <= merge_gap:
+                intervals[-1][1] = end
+            else:
+                intervals.append([begin, end])
+        return [tuple(interval) for interval in intervals]
+    
+    def _make_time_mapper(self, intervals: List):
+        """
+        构造从拼接后音频时间到原始音频时间的映射函数
+        :param intervals: 语音区间列表（采样点）
+        :return: 映射函数
+        """
+        rate = self.VAD_SAMPLE_RATE
+        trimmed_starts = []
+        original_starts = []
+        offset = 0
+        for start, end in intervals:
+            trimmed_starts.append(offset / rate)
+            original_starts.append(start / rate)
+            offset += end - start
+        
+        def to_original(t: float) -> float:
+            i = max(0, bisect.bisect_right(trimmed_starts, t) - 1)
+            return original_starts[i] + (t - trimmed_starts[i])
+        return to_original
+    
     def process_video(self, video_path: str, output_dir: str = None) -> Dict:
         """
         处理视频文件：提取音频 + 转写文本
@@ -143,21 +727,22 @@ class AudioParser:
             output_dir.mkdir(parents=True, exist_ok=True)
         
         try:
-            # 1. 提取音频
+            # 1-2. 提取音频并转写，解码与转写流水线并行，解码的同时写出音频文件
             audio_path = output_dir / f"{video_path.stem}_audio.wav"
-            self.extract_audio_from_video(str(video_path), str(audio_path))
-            
-            # 2. 转写音频
-            transcription = self.transcribe_audio(str(audio_path))
+            transcription = self.transcribe_video_streaming(str(video_path), audio_path=str(audio_path))
             
-            # 3. 保存转写结果
+            # 3-4. 保存转写结果和 SRT 字幕文件，两者互不依赖，并行写入
             transcript_path = output_dir / f"{video_path.stem}_transcript.json"
-            with open(transcript_path, 'w', encoding='utf-8') as f:
-                json.dump(transcription, f, ensure_ascii=False, indent=2)
-            
-            # 4. 生成 SRT 字幕文件
             srt_path = output_dir / f"{video_path.stem}_subtitles.srt"
-            self._save_as_srt(transcription['segments'], str(srt_path))
+            pool = self._get_io_pool()
+            futures = [
+                pool.submit(self._write_transcript_json, transcription, str(transcript_path)),
+                pool.submit(self._save_as_srt, transcription['segments'], str(srt_path))
+            ]
+            wait(futures)
+            for future in futures:
+                # 任一写入失败时抛出其异常
+                future.result()
             
             result = {
                 'video_path': str(video_path),
@@ -174,117 +759,193 @@ class AudioParser:
             self.console.print(f"[red]❌ 视频处理失败: {str(e)}[/]")
             raise e
     
+    def _format_time_for_srt(self, seconds: float) -> str:
+        """
+        将秒数转换为 SRT 时间格式
+        :param seconds: 秒数
+        :return: HH:MM:SS,mmm 格式的时间
+        """
+        # 先换算成整数毫秒，再用整数除法逐级拆分，避免多次浮点取模
+        total_ms = int(round(seconds * 1000))
+        total_secs, millisecs = divmod(total_ms, 1000)
+        total_minutes, secs = divmod(total_secs, 60)
+        hours, minutes = divmod(total_minutes, 60)
+        return "%02d:%02d:%02d,%03d" % (hours, minutes, secs, millisecs)
+    
+    def _generate_srt_content(self, segments: List[Dict]) -> str:
+        """
+        生成 SRT 字幕内容
+        :param segments: 转写片段列表
+        :return: SRT 文本
+        """
+        fmt = self._format_time_for_srt
+        return "".join(
+            f"{i}\n{fmt(segment['start'])} --> {fmt(segment['end'])}\n{segment['text']}\n\n"
+            for i, segment in enumerate(segments, 1)
+        )
+    
     def _save_as_srt(self, segments: List[Dict], srt_path: str):
         """
         将转写片段保存为 SRT 字幕文件
         :param segments: 转写片段列表
         :param srt_path: SRT文件保存路径
         """
-        def format_time(seconds):
-            """将秒数转换为 SRT 时间格式"""
-            hours = int(seconds // 3600)
-            minutes = int((seconds % 3600) // 60)
-            secs = int(seconds % 60)
-            millisecs = int((seconds % 1) * 1000)
-            return f"{hours:02d}:{minutes:02d}:{secs:02d},{millisecs:03d}"
-        
+        # 整个字幕一次写入
         with open(srt_path, 'w', encoding='utf-8') as f:
-            for i, segment in enumerate(segments, 1):
-                start_time = format_time(segment['start'])
-                end_time = format_time(segment['end'])
-                text = segment['text']
-                
-                f.write(f"{i}\n")
-                f.write(f"{start_time} --> {end_time}\n")
-                f.write(f"{text}\n\n")
+            f.write(self._generate_srt_content(segments))
         
         self.console.print(f"[green]📄 SRT字幕文件已保存: {Path(srt_path).name}[/]")
     
     def transcribe_from_url(self, url: str, save_audio: bool = True, save_transcript: bool = True) -> Optional[Dict]:
         """
-        从URL直接转写音频（使用yt-dlp下载音频）
+        从URL直接转写音频（使用yt-dlp获取音频）
+        不保存音频时由 ffmpeg 直接读取音频流并解码到内存，不写临时文件
         :param url: 视频URL
         :param save_audio: 是否保存音频文件
         :param save_transcript: 是否保存转写文件
         :return: 转写结果
         """
+        # yt_dlp 导入较慢，仅在真正需要时加载；首次导入后再次执行只是一次 sys.modules 查找
         import yt_dlp
-        import tempfile
         
         try:
-            # 创建临时目录
-            with tempfile.TemporaryDirectory() as temp_dir:
-                temp_path = Path(temp_dir)
-                
-                # 配置yt-dlp选项，只下载音频
-                ydl_opts = {
-                    'format': 'bestaudio/best',
-                    'outtmpl': str(temp_path / '%(title)s.%(ext)s'),
-                    'extractaudio': True,
-                    'audioformat': 'wav',
-                    'quiet': True,
-                    'no_warnings': True
-                }
-                
-                self.console.print(f"[cyan]🎵 正在从URL提取音频...[/]")
-                
-                # 下载音频
-                with yt_dlp.YoutubeDL(ydl_opts) as ydl:
-                    info = ydl.extract_info(url, download=True)
+            self.console.print(f"[cyan]🎵 正在从URL提取音频...[/]")
+            
+            if save_audio and self.audio_output_dir:
+                # 需要保存音频：下载到临时目录，转写后复制到输出目录
+                with tempfile.TemporaryDirectory() as temp_dir:
+                    temp_path = Path(temp_dir)
                     
-                    # 查找下载的音频文件
-                    audio_files = list(temp_path.glob("*"))
-                    if not audio_files:
-                        raise Exception("未找到下载的音频文件")
+                    # 配置yt-dlp选项，只下载音频
+                    ydl_opts = {
+                        'format': 'bestaudio/best',
+                        'outtmpl': str(temp_path / '%(title)s.%(ext)s'),
+                        'extractaudio': True,
+                        'audioformat': 'wav',
+                        'quiet': True,
+                        'no_warnings': True
+                    }
                     
-                    audio_file = audio_files[0]
+                    with yt_dlp.YoutubeDL(ydl_opts) as ydl:
+                        info = ydl.extract_info(url, download=True)
+                    
+                    # 查找下载的音频文件：临时目录中只有这一个文件，取第一个目录项即可
+                    with os.scandir(temp_path) as entries:
+                        audio_file = next(entries, None)
+                    if audio_file is None:
+                        raise Exception("未找到下载的音频文件")
+                    audio_file = Path(audio_file.path)
                     
                     # 转写音频
                     transcription = self.transcribe_audio(str(audio_file))
                     
-                    # 保存文件（如果配置了输出目录）
-                    if save_audio and self.audio_output_dir:
-                        saved_audio_path = self.audio_output_dir / f"{info.get('id', 'unknown')}_audio.wav"
-                        import shutil
-                        shutil.copy2(audio_file, saved_audio_path)
-                        transcription['audio_path'] = str(saved_audio_path)
-                    
-                    if save_transcript and self.transcript_output_dir:
-                        transcript_path = self.transcript_output_dir / f"{info.get('id', 'unknown')}_transcript.json"
-                        with open(transcript_path, 'w', encoding='utf-8') as f:
-                            json.dump(transcription, f, ensure_ascii=False, indent=2)
-                        transcription['transcript_path'] = str(transcript_path)
-                    
-                    return transcription
-                    
+                    saved_audio_path = self.audio_output_dir / f"{info.get('id', 'unknown')}_audio.wav"
+                    shutil.copy2(audio_file, saved_audio_path)
+                    transcription['audio_path'] = str(saved_audio_path)
+            else:
+                # 只解析音频流地址，不下载
+                with yt_dlp.YoutubeDL({'format': 'bestaudio/best', 'quiet': True, 'no_warnings': True}) as ydl:
+                    info = ydl.extract_info(url, download=False)
+                
+                audio = self._decode_audio(info['url'], info.get('http_headers'))
+                transcription = self.transcribe_audio(audio)
+            
+            if save_transcript and self.transcript_output_dir:
+                transcript_path = self.transcript_output_dir / f"{info.get('id', 'unknown')}_transcript.json"
+                write_json(transcript_path, transcription)
+                transcription['transcript_path'] = str(transcript_path)
+            
+            return transcription
+            
         except Exception as e:
             self.console.print(f"[red]❌ URL音频转写失败: {str(e)}[/]")
             return None
     
-    def batch_process_videos(self, video_paths: List[str], output_dir: str = None) -> List[Dict]:
+    def batch_process_videos(self, video_paths: List[str], output_dir: str = None,
+                             max_workers: int = None) -> List[Dict]:
         """
         批量处理多个视频文件
         :param video_paths: 视频文件路径列表
         :param output_dir: 输出目录
-        :return: 处理结果列表
+        :param max_workers: 并行进程数，默认CPU核数的一半，为1时在当前进程逐个处理
+        :return: 处理结果列表，顺序与输入一致（失败的视频不包含在内）
         """
-        results = []
+        n = len(video_paths)
+        if max_workers is None:
+            max_workers = max(1, (os.cpu_count() or 2) // 2)
+        results = [None] * n
+        
+        # 执行器在进度条启动前创建，工作进程用 forkserver/spawn 启动：
+        # fork 会复制进度条刷新线程和已初始化的 torch/CTranslate2 线程池，子进程可能死锁，
+        # 且会继承父进程缓存的模型，线程数限制不再生效；每个工作进程在初始化时各自加载一次模型
+        executor = None
+        if max_workers > 1 and n > 1:
+            method = 'forkserver' if 'forkserver' in multiprocessing.get_all_start_methods() else 'spawn'
+            executor = ProcessPoolExecutor(
+                max_workers=min(max_workers, n),
+                mp_context=multiprocessing.get_context(method),
+                initializer=_init_worker,
+                initargs=(self.model_size, self.backend, self.vad, self.device, self.compute_type)
+            )
         
         with Progress(
             SpinnerColumn(),
             TextColumn("[progress.description]{task.description}"),
             console=self.console
         ) as progress:
-            task = progress.add_task("[cyan]批量处理视频", total=len(video_paths))
+            task = progress.add_task("[cyan]批量处理视频", total=n)
             
-            for i, video_path in enumerate(video_paths):
-                progress.update(task, description=f"[cyan]处理第 {i+1}/{len(video_paths)} 个视频")
-                try:
-                    result = self.process_video(video_path, output_dir)
-                    results.append(result)
-                except Exception as e:
-                    self.console.print(f"[red]❌ 处理视频失败 {video_path}: {str(e)}[/]")
-                progress.advance(task)
-        
-        self.console.print(f"[green]✅ 批量处理完成，成功处理 {len(results)}/{len(video_paths)} 个视频[/]")
-        return results
\ No newline at end of file
+            if executor is None:
+                for i, video_path in enumerate(video_paths):
+                    progress.update(task, description=f"[cyan]处理第 {i+1}/{n} 个视频")
+                    try:
+                        results[i] = self.process_video(video_path, output_dir)
+                    except Exception as e:
+                        self.console.print(f"[red]❌ 处理视频失败 {video_path}: {str(e)}[/]")
+                    progress.advance(task)
+            else:
+                with executor:
+                    futures = {
+                        executor.submit(_process_video_worker, video_path, output_dir): i
+                        for i, video_path in enumerate(video_paths)
+                    }
+                    for done, future in enumerate(as_completed(futures), 1):
+                        i = futures[future]
+                        try:
+                            results[i] = future.result()
+                        except Exception as e:
+                            self.console.print(f"[red]❌ 处理视频失败 {video_paths[i]}: {str(e)}[/]")
+                        progress.update(task, advance=1, description=f"[cyan]已完成 {done}/{n} 个视频")
+        
+        results = [r for r in results if r]
+        self.console.print(f"[green]✅ 批量处理完成，成功处理 {len(results)}/{n} 个视频[/]")
+        return results
+
+
+# 进程池工作进程内的音频解析器，由 _init_worker 创建
+_worker_parser = None
+
+# 每个工作进程的推理线程数，避免多个进程的线程互相争抢CPU
+_WORKER_THREADS = "2"
+
+
+def _init_worker(model_size: str = "tiny", backend: Optional[str] = None, vad: bool = True,
+                 device: Optional[str] = None, compute_type: Optional[str] = None):
+    """
+    进程池初始化函数，限制推理线程数并加载一次模型
+    """
+    global _worker_parser
+    os.environ["OMP_NUM_THREADS"] = _WORKER_THREADS
+    os.environ["MKL_NUM_THREADS"] = _WORKER_THREADS
+    # spawn/forkserver 启动的工作进程此时尚未导入 torch，环境变量在加载模型前生效；已导入时直接设置
+    if 'torch' in sys.modules:
+        sys.modules['torch'].set_num_threads(int(_WORKER_THREADS))
+    _worker_parser = AudioParser(console=Console(quiet=True), model_size=model_size,
+                                 backend=backend, vad=vad, device=device, compute_type=compute_type)
+
+
+def _process_video_worker(video_path: str, output_dir: Optional[str]) -> Dict:
+    """
+    进程池工作函数，使用本进程的解析器处理单个视频
+    """
+    return _worker_parser.process_video(video_path, output_dir)
@@ -1,10 +1,56 @@
-import json
+import re
+import bisect
+from operator import itemgetter
 from pathlib import Path
-from typing import Dict, List, Optional
+from typing import BinaryIO, Dict, List, Optional, Union
 from datetime import datetime
 from rich.console import Console
 from rich.table import Table
 from rich.panel import Panel
+from utils.text import preview
+from utils.jsonio import write_json
+
+
+# 钩子类型判断规则，按优先级排列：(类型, 中文名称, 关键词)
+HOOK_KEYWORDS = (
+    ('question', '疑问式钩子', ('？', '?')),
+    ('reversal', '反转式钩子', ('但是', '然而', '不过', '其实')),
+    ('value', '干货式钩子', ('秘密', '方法', '技巧', '绝招')),
+    ('shock', '震惊式钩子', ('震惊', '惊人', '不敢相信', '太厉害')),
+)
+
+HOOK_TYPE_LABELS = {hook_type: label for hook_type, label, _ in HOOK_KEYWORDS}
+HOOK_TYPE_LABELS['unknown'] = '未知类型'
+
+# 类型优先级，数值越小越优先
+_HOOK_PRIORITY = {hook_type: rank for rank, (hook_type, _, _) in enumerate(HOOK_KEYWORDS)}
+
+# 所有关键词合并为一个正则，每种类型一个命名分组，一次扫描即可找出出现过的类型
+_HOOK_RE = re.compile('|'.join(
+    f"(?P<{hook_type}>{'|'.join(map(re.escape, words))})"
+    for hook_type, _, words in HOOK_KEYWORDS
+))
+
+
+def _classify_hook(hook_text: str) -> str:
+    """
+    判断钩子类型
+    :param hook_text: 开头钩子文本
+    :return: 优先级最高的匹配类型，无匹配时返回 unknown
+    """
+    return min((match.lastgroup for match in _HOOK_RE.finditer(hook_text)),
+               key=_HOOK_PRIORITY.__getitem__, default='unknown')
+
+
+def _hook_segments(segments: List[Dict], cutoff: float = 3.0) -> List[Dict]:
+    """
+    取出开头钩子时段内的片段
+    :param segments: 按开始时间排序的转写片段
+    :param cutoff: 钩子时段长度（秒）
+    :return: 开始时间不晚于 cutoff 的片段
+    """
+    # 片段按开始时间有序，二分查找截止位置，无需遍历全部片段
+    return segments[:bisect.bisect_right(segments, cutoff, key=itemgetter('start'))]
 
 
 class ReportGenerator:
@@ -18,6 +64,20 @@ class ReportGenerator:
         :param console: Rich Console对象
         """
         self.console = console or Console()
+        # 已确认存在的报告目录，Markdown 和 JSON 报告通常写入同一目录
+        self._ready_dirs = set()
+        # 最近一次钩子分析的 (片段列表, 结果)，Markdown、JSON 报告和摘要依次分析同一份片段
+        self._hook_cache = None
+    
+    def _ensure_parent(self, output_path: Path):
+        """
+        确保报告文件的父目录存在
+        :param output_path: 报告文件路径
+        """
+        parent = output_path.parent
+        if parent not in self._ready_dirs:
+            parent.mkdir(parents=True, exist_ok=True)
+            self._ready_dirs.add(parent)
     
     def generate_markdown_report(self, video_info: Dict, transcription_data: Dict, 
                                output_path: str = None) -> str:
@@ -38,7 +98,7 @@ class ReportGenerator:
                 output_path = f"video_analysis_report_{timestamp}.md"
             
             output_path = Path(output_path)
-            output_path.parent.mkdir(parents=True, exist_ok=True)
+            self._ensure_parent(output_path)
             
             # 保存报告
             with open(output_path, 'w', encoding='utf-8') as f:
@@ -114,29 +174,16 @@ class ReportGenerator:
         """
         提取开头3秒的钩子内容
         """
-        hook_segments = [seg for seg in segments if seg['start'] <= 3.0]
+        hook = self._analyze_hook(segments)
         
-        if not hook_segments:
+        if hook['type'] == 'none':
             return "⚠️ 未检测到开头3秒内的内容"
         
-        hook_text = " ".join([seg['text'] for seg in hook_segments])
-        
-        # 简单的钩子类型判断
-        hook_type = "未知类型"
-        if any(char in hook_text for char in ['？', '?']):
-            hook_type = "疑问式钩子"
-        elif any(word in hook_text for word in ['但是', '然而', '不过', '其实']):
-            hook_type = "反转式钩子"
-        elif any(word in hook_text for word in ['秘密', '方法', '技巧', '绝招']):
-            hook_type = "干货式钩子"
-        elif any(word in hook_text for word in ['震惊', '惊人', '不敢相信', '太厉害']):
-            hook_type = "震惊式钩子"
-        
-        return f"""**钩子类型**: {hook_type}
+        return f"""**钩子类型**: {HOOK_TYPE_LABELS[hook['type']]}
 
-**钩子内容**: {hook_text}
+**钩子内容**: {hook['content']}
 
-**时长**: {hook_segments[-1]['end']:.1f}秒"""
+**时长**: {hook['duration']:.1f}秒"""
     
     def _build_segments_section(self, segments: List[Dict]) -> str:
         """
@@ -145,15 +192,16 @@ class ReportGenerator:
         if not segments:
             return "暂无字幕数据"
         
-        segments_md = ""
+        # 收集各行后一次拼接，避免循环中字符串反复复制
+        parts = []
         for i, segment in enumerate(segments, 1):
             start_time = self._format_time(segment['start'])
             end_time = self._format_time(segment['end'])
             text = segment['text']
             
-            segments_md += f"**{i}.** `{start_time} - {end_time}` {text}\n\n"
+            parts.append(f"**{i}.** `{start_time} - {end_time}` {text}\n\n")
         
-        return segments_md
+        return "".join(parts)
     
     def _analyze_content_structure(self, segments: List[Dict]) -> str:
         """
@@ -162,15 +210,15 @@ class ReportGenerator:
         if not segments:
             return "暂无数据进行结构分析"
         
-        total_duration = segments[-1]['end'] if segments else 0
-        total_words = sum(len(seg['text']) for seg in segments)
-        avg_segment_length = total_words / len(segments) if segments else 0
-        
-        # 计算语速（字/分钟）
-        speech_rate = (total_words / total_duration * 60) if total_duration > 0 else 0
+        # 片段长度只计算一次，基础数据与节奏分析共用
+        segment_lengths = [len(seg['text']) for seg in segments]
+        data = self._get_structure_data(segments, segment_lengths)
+        total_duration = data['total_duration']
+        total_words = data['total_words']
+        avg_segment_length = data['avg_segment_length']
+        speech_rate = data['speech_rate']
         
         # 分析节奏变化（基于片段长度变化）
-        segment_lengths = [len(seg['text']) for seg in segments]
         rhythm_analysis = "节奏平稳" if len(set(segment_lengths)) < len(segment_lengths) * 0.3 else "节奏多变"
         
         return f"""### 基础数据
@@ -220,13 +268,13 @@ class ReportGenerator:
         return str(number)
     
     def generate_json_report(self, video_info: Dict, transcription_data: Dict, 
-                           output_path: str = None) -> str:
+                           output_path: Union[str, BinaryIO] = None) -> Union[str, BinaryIO]:
         """
         生成 JSON 格式的结构化报告
         :param video_info: 视频基本信息
         :param transcription_data: 转写数据
-        :param output_path: 报告保存路径
-        :return: 报告文件路径
+        :param output_path: 报告保存路径，也可以是以二进制方式写入的文件对象（如 io.BytesIO）
+        :return: 报告文件路径，传入文件对象时原样返回
         """
         try:
             # 构建结构化数据
@@ -240,17 +288,21 @@ class ReportGenerator:
                 }
             }
             
+            # 写入调用方提供的文件对象，不落盘
+            if hasattr(output_path, 'write'):
+                write_json(output_path, report_data, indent=False)
+                return output_path
+            
             # 确定输出路径
             if output_path is None:
                 timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
                 output_path = f"video_analysis_data_{timestamp}.json"
             
             output_path = Path(output_path)
-            output_path.parent.mkdir(parents=True, exist_ok=True)
+            self._ensure_parent(output_path)
             
-            # 保存报告
-            with open(output_path, 'w', encoding='utf-8') as f:
-                json.dump(report_data, f, ensure_ascii=False, indent=2)
+            # 保存报告：紧凑格式减小文件体积
+            write_json(output_path, report_data, indent=False)
             
             self.console.print(f"[green]📊 JSON报告已生成: {output_path.name}[/]")
             return str(output_path)
@@ -261,43 +313,43 @@ class ReportGenerator:
     
     def _analyze_hook(self, segments: List[Dict]) -> Dict:
         """
-        分析开头钩子的结构化数据
+        分析开头钩子的结构化数据，同一片段列表只分析一次
         """
-        hook_segments = [seg for seg in segments if seg['start'] <= 3.0]
+        # 缓存持有片段列表的引用，按对象身份比较不会误命中
+        if self._hook_cache is not None and self._hook_cache[0] is segments:
+            return self._hook_cache[1]
         
-        if not hook_segments:
-            return {'type': 'none', 'content': '', 'duration': 0}
-        
-        hook_text = " ".join([seg['text'] for seg in hook_segments])
-        hook_duration = hook_segments[-1]['end']
+        hook_segments = _hook_segments(segments)
         
-        # 钩子类型判断
-        hook_type = 'unknown'
-        if any(char in hook_text for char in ['？', '?']):
-            hook_type = 'question'
-        elif any(word in hook_text for word in ['但是', '然而', '不过', '其实']):
-            hook_type = 'reversal'
-        elif any(word in hook_text for word in ['秘密', '方法', '技巧', '绝招']):
-            hook_type = 'value'
-        elif any(word in hook_text for word in ['震惊', '惊人', '不敢相信', '太厉害']):
-            hook_type = 'shock'
+        if not hook_segments:
+            result = {'type': 'none', 'content': '', 'duration': 0}
+        else:
+            hook_text = " ".join([seg['text'] for seg in hook_segments])
+            result = {
+                'type': _classify_hook(hook_text),
+                'content': hook_text,
+                'duration': hook_segments[-1]['end'],
+                'segments': hook_segments
+            }
         
-        return {
-            'type': hook_type,
-            'content': hook_text,
-            'duration': hook_duration,
-            'segments': hook_segments
-        }
+        self._hook_cache = (segments, result)
+        return result
     
-    def _get_structure_data(self, segments: List[Dict]) -> Dict:
+    def _get_structure_data(self, segments: List[Dict], segment_lengths: List[int] = None) -> Dict:
         """
         获取内容结构的数据分析
+        :param segments: 转写片段
+        :param segment_lengths: 已计算好的各片段字数，为None时重新计算
         """
         if not segments:
             return {}
         
+        if segment_lengths is None:
+            segment_lengths = [len(seg['text']) for seg in segments]
+        
         total_duration = segments[-1]['end']
-        total_words = sum(len(seg['text']) for seg in segments)
+        total_words = sum(segment_lengths)
+        # 计算语速（字/分钟）
         speech_rate = (total_words / total_duration * 60) if total_duration > 0 else 0
         
         return {
@@ -330,7 +382,7 @@ class ReportGenerator:
         hook_analysis = self._analyze_hook(segments)
         
         hook_panel = Panel(
-            f"**类型**: {hook_analysis['type']}\n**内容**: {hook_analysis['content'][:100]}...\n**时长**: {hook_analysis['duration']:.1f}秒",
+            f"**类型**: {hook_analysis['type']}\n**内容**: {preview(hook_analysis['content'], 100)}\n**时长**: {hook_analysis['duration']:.1f}秒",
             title="🎯 开头钩子分析",
             border_style="green"
         )
@@ -5,18 +5,50 @@ BVS Analyzer 模块测试脚本
 用于验证各个模块是否正常导入和基本功能
 """
 
+import os
 import sys
+import importlib
+from multiprocessing import get_context
 from pathlib import Path
 from rich.console import Console
 from rich.panel import Panel
 from rich.table import Table
+from utils.capture import run_captured_parallel
+from utils.modules import is_installed, read_requirements
 
 
-def test_imports():
+def _print_status(console: Console, title: str, message: str, style: str):
+    """
+    输出单项检查的结论，用单行标题代替 Panel，省去边框的测量和折行计算；Panel 只留给开始和总结
+    :param console: Rich Console对象
+    :param title: 结论标题
+    :param message: 结论内容
+    :param style: 标题颜色
+    """
+    console.print(f"[bold {style}]{title}[/] {message}")
+
+
+def _probe_import(module_name: str, class_name: str) -> tuple:
+    """
+    在子进程中导入模块并取出类，检查其可用性
+    :param module_name: 模块名
+    :param class_name: 类名
+    :return: (是否成功, 错误信息)
+    """
+    try:
+        module = importlib.import_module(module_name)
+        getattr(module, class_name)
+        return True, None
+    except Exception as e:
+        return False, str(e)
+
+
+def test_imports(console: Console = None):
     """
     测试模块导入
+    :param console: 输出用的 Console，为None时新建
     """
-    console = Console()
+    console = console or Console()
     results = []
     
     # 测试导入各个模块
@@ -27,13 +59,12 @@ def test_imports():
         ('report.report_generator', 'ReportGenerator'),
     ]
     
-    for module_name, class_name in modules_to_test:
-        try:
-            module = __import__(module_name, fromlist=[class_name])
-            cls = getattr(module, class_name)
-            results.append((module_name, class_name, '✅ 成功', None))
-        except Exception as e:
-            results.append((module_name, class_name, '❌ 失败', str(e)))
+    # 在 spawn 启动的子进程中导入，torch、yt_dlp 等重量级依赖不会留在当前进程中
+    with get_context("spawn").Pool(min(4, len(modules_to_test))) as pool:
+        outcomes = pool.starmap(_probe_import, modules_to_test)
+    
+    for (module_name, class_name), (ok, error) in zip(modules_to_test, outcomes):
+        results.append((module_name, class_name, '✅ 成功' if ok else '❌ 失败', error))
     
     # 显示结果
     table = Table(title="模块导入测试结果")
@@ -48,50 +79,33 @@ def test_imports():
     console.print(table)
     
     # 统计结果
-    success_count = sum(1 for _, _, status, _ in results if '✅' in status)
+    success_count = sum(status.startswith('✅') for _, _, status, _ in results)
     total_count = len(results)
     
     if success_count == total_count:
-        console.print(Panel(
-            f"🎉 所有模块导入成功！({success_count}/{total_count})",
-            title="测试完成",
-            border_style="green"
-        ))
+        _print_status(console, "测试完成", f"🎉 所有模块导入成功！({success_count}/{total_count})", "green")
         return True
     else:
-        console.print(Panel(
-            f"⚠️ 部分模块导入失败：{success_count}/{total_count}",
-            title="测试完成",
-            border_style="yellow"
-        ))
+        _print_status(console, "测试完成", f"⚠️ 部分模块导入失败：{success_count}/{total_count}", "yellow")
         return False
 
 
-def test_dependencies():
+def test_dependencies(console: Console = None):
     """
-    测试关键依赖包
+    测试依赖包，依赖列表取自 requirements.txt
+    :param console: 输出用的 Console，为None时新建
     """
-    console = Console()
+    console = console or Console()
     results = []
     
-    # 测试关键依赖
-    dependencies = [
-        'yt_dlp',
-        'whisper',
-        'rich',
-        'requests',
-        'pathlib',
-        'json',
-        'subprocess',
-        'argparse'
-    ]
+    dependencies = read_requirements(Path(__file__).parent / 'requirements.txt')
     
+    # 对照已安装包的元数据判断，不执行模块代码（whisper 会连带导入 torch）
     for dep in dependencies:
-        try:
-            __import__(dep)
+        if is_installed(dep):
             results.append((dep, '✅ 已安装', None))
-        except ImportError as e:
-            results.append((dep, '❌ 缺失', str(e)))
+        else:
+            results.append((dep, '❌ 缺失', f"未安装 {dep}"))
     
     # 显示结果
     table = Table(title="依赖包检查结果")
@@ -105,22 +119,14 @@ def test_dependencies():
     console.print(table)
     
     # 统计结果
-    success_count = sum(1 for _, status, _ in results if '✅' in status)
+    success_count = sum(status.startswith('✅') for _, status, _ in results)
     total_count = len(results)
     
     if success_count == total_count:
-        console.print(Panel(
-            f"🎉 所有依赖包检查通过！({success_count}/{total_count})",
-            title="依赖检查完成",
-            border_style="green"
-        ))
+        _print_status(console, "依赖检查完成", f"🎉 所有依赖包检查通过！({success_count}/{total_count})", "green")
         return True
     else:
-        console.print(Panel(
-            f"⚠️ 部分依赖包缺失：{success_count}/{total_count}\n请运行: pip install -r requirements.txt",
-            title="依赖检查完成",
-            border_style="yellow"
-        ))
+        _print_status(console, "依赖检查完成", f"⚠️ 部分依赖包缺失：{success_count}/{total_count}\n请运行: pip install -r requirements.txt", "yellow")
         return False
 
 
@@ -141,30 +147,25 @@ def test_basic_functionality():
         parser = AudioParser(console=console)
         reporter = ReportGenerator(console=console)
         
-        console.print(Panel(
-            "✅ 所有模块实例化成功！\n" +
-            "- VideoDownloader: 已创建\n" +
-            "- AudioParser: 已创建\n" +
-            "- ReportGenerator: 已创建",
-            title="功能测试完成",
-            border_style="green"
-        ))
+        _print_status(console, "功能测试完成",
+                      "✅ 所有模块实例化成功！\n" +
+                      "- VideoDownloader: 已创建\n" +
+                      "- AudioParser: 已创建\n" +
+                      "- ReportGenerator: 已创建",
+                      "green")
         return True
         
     except Exception as e:
-        console.print(Panel(
-            f"❌ 模块实例化失败: {str(e)}",
-            title="功能测试失败",
-            border_style="red"
-        ))
+        _print_status(console, "功能测试失败", f"❌ 模块实例化失败: {str(e)}", "red")
         return False
 
 
-def check_project_structure():
+def check_project_structure(console: Console = None):
     """
     检查项目结构
+    :param console: 输出用的 Console，为None时新建
     """
-    console = Console()
+    console = console or Console()
     
     required_files = [
         'main.py',
@@ -178,10 +179,19 @@ def check_project_structure():
         'docs/task.md'
     ]
     
+    # 每个涉及的目录只遍历一次，收集已存在的文件，代替逐个文件 stat
+    existing = set()
+    for directory in {os.path.dirname(file_path) for file_path in required_files}:
+        try:
+            with os.scandir(directory or '.') as entries:
+                existing.update(Path(directory, entry.name).as_posix()
+                                for entry in entries if entry.is_file())
+        except OSError:
+            continue
+    
     results = []
     for file_path in required_files:
-        path = Path(file_path)
-        if path.exists():
+        if file_path in existing:
             results.append((file_path, '✅ 存在'))
         else:
             results.append((file_path, '❌ 缺失'))
@@ -196,22 +206,14 @@ def check_project_structure():
     
     console.print(table)
     
-    success_count = sum(1 for _, status in results if '✅' in status)
+    success_count = sum(status.startswith('✅') for _, status in results)
     total_count = len(results)
     
     if success_count == total_count:
-        console.print(Panel(
-            f"🎉 项目结构完整！({success_count}/{total_count})",
-            title="结构检查完成",
-            border_style="green"
-        ))
+        _print_status(console, "结构检查完成", f"🎉 项目结构完整！({success_count}/{total_count})", "green")
         return True
     else:
-        console.print(Panel(
-            f"⚠️ 部分文件缺失：{success_count}/{total_count}",
-            title="结构检查完成",
-            border_style="yellow"
-        ))
+        _print_status(console, "结构检查完成", f"⚠️ 部分文件缺失：{success_count}/{total_count}", "yellow")
         return False
 
 
@@ -227,27 +229,35 @@ def main():
         border_style="blue"
     ))
     
-    # 执行各项测试
-    tests = [
+    # 前三项检查互不依赖，耗时主要在导入和文件系统调用上，并行执行，完成后按原顺序打印
+    preflight = [
         ("项目结构检查", check_project_structure),
         ("依赖包检查", test_dependencies),
-        ("模块导入测试", test_imports),
-        ("基本功能测试", test_basic_functionality)
+        ("模块导入测试", test_imports)
     ]
+    outcomes = run_captured_parallel(preflight, console)
     
     results = []
-    for test_name, test_func in tests:
+    for test_name, success, error, output in outcomes:
         console.print(f"\n[cyan]正在执行: {test_name}[/]")
-        try:
-            success = test_func()
-            results.append((test_name, success))
-        except Exception as e:
-            console.print(f"[red]测试异常: {str(e)}[/]")
-            results.append((test_name, False))
+        console.file.write(output)
+        if error is not None:
+            console.print(f"[red]测试异常: {str(error)}[/]")
+        results.append((test_name, success))
+    
+    # 基本功能测试会加载 Whisper 模型，耗时最长，在预检完成后单独执行
+    test_name = "基本功能测试"
+    console.print(f"\n[cyan]正在执行: {test_name}[/]")
+    try:
+        success = test_basic_functionality()
+        results.append((test_name, success))
+    except Exception as e:
+        console.print(f"[red]测试异常: {str(e)}[/]")
+        results.append((test_name, False))
     
     # 总结
     console.print("\n" + "="*50)
-    success_count = sum(1 for _, success in results if success)
+    success_count = sum(success for _, success in results)
     total_count = len(results)
     
     if success_count == total_count:
@@ -3,366 +3,775 @@
 """
 BVS Analyzer 单元测试
 测试第一阶段核心功能模块
+夹具（console、downloader、parser、reporter、analyzer、clean_reports）定义在 conftest.py 中
+
+安装 pytest-xdist 后可并行运行（按模块分配，模块级夹具不会在多个进程中重复创建）:
+    pytest test_unit.py -n auto --dist=loadscope
 """
 
-import unittest
+import io
+import os
+import json
+import time
 import tempfile
-import shutil
 from pathlib import Path
-from unittest.mock import Mock, patch, MagicMock
-import json
+from unittest.mock import Mock, patch
+
+import pytest
 from rich.console import Console
+from utils.modules import is_installed
 
-# 导入待测试的模块
-from crawler.video_downloader import VideoDownloader
-from parser.audio_parser import AudioParser
-from report.report_generator import ReportGenerator
-from main import BVSAnalyzer
+# 待测试的模块在用到的测试和夹具中导入，只运行部分测试（如 -k reporter）时不加载其余模块
 
+DOUYIN_TEST_URL = "https://www.douyin.com/jingxuan?modal_id=7526877413813292329"
 
-class TestVideoDownloader(unittest.TestCase):
-    """
-    测试视频下载器模块
-    """
+
+# ---------------------------------------------------------------------------
+# 视频下载器
+# ---------------------------------------------------------------------------
+
+def test_downloader_init(downloader, console):
+    """测试初始化"""
+    from crawler.video_downloader import VideoDownloader
+    assert isinstance(downloader, VideoDownloader)
+    assert downloader.console == console
+
+
+def test_downloader_configure_options(downloader, shared_tmp):
+    """测试配置选项"""
+    downloader.configure_options(
+        output_path=str(shared_tmp),
+        format_selector="best[height<=720]",
+        save_metadata=True
+    )
+    
+    # 验证配置是否正确设置
+    assert downloader.output_path == str(shared_tmp)
+    assert downloader.format_selector == "best[height<=720]"
+    assert downloader.save_metadata
+
+
+@patch('yt_dlp.YoutubeDL')
+def test_download_reuses_ydl_across_output_dirs(mock_ytdl, console, tmp_path):
+    """测试不同输出目录的下载复用同一个 YoutubeDL 实例，关闭后释放"""
+    from crawler.video_downloader import VideoDownloader
+    
+    mock_instance = mock_ytdl.return_value
+    mock_instance.params = {}
+    mock_instance.extract_info.return_value = {'title': '测试视频'}
+    downloader = VideoDownloader(console=console, download_path=str(tmp_path))
+    
+    for name in ("video_1", "video_2"):
+        result = downloader.download_single_video("https://test.com/video", name)
+        assert result['download_path'] == str(tmp_path / name)
+    
+    # 输出目录不同也只创建一个实例，每次下载通过 paths 指向各自目录
+    mock_ytdl.assert_called_once()
+    assert mock_instance.params['paths'] == {'home': str(tmp_path / "video_2")}
+    
+    downloader.close()
+    mock_instance.close.assert_called_once()
+
+
+@patch('yt_dlp.YoutubeDL')
+def test_get_video_info(mock_ytdl, downloader):
+    """测试获取视频信息"""
+    # 模拟返回数据
+    mock_info = {
+        'id': 'test_video_id',
+        'title': '测试视频标题',
+        'uploader': '测试作者',
+        'duration': 300,
+        'view_count': 10000,
+        'like_count': 500
+    }
+    
+    mock_instance = Mock()
+    mock_instance.extract_info.return_value = mock_info
+    mock_ytdl.return_value.__enter__.return_value = mock_instance
+    
+    # 执行测试
+    result = downloader.get_video_info("https://test.com/video")
+    
+    # 验证结果
+    assert result == mock_info
+    mock_instance.extract_info.assert_called_once()
+
+
+@patch('yt_dlp.YoutubeDL')
+def test_get_video_info_cache_per_instance(mock_ytdl, console, tmp_path):
+    """测试视频信息只在同一实例内缓存，refresh 和新实例都会重新请求"""
+    from crawler.video_downloader import VideoDownloader
+
+    mock_instance = mock_ytdl.return_value.__enter__.return_value
+    mock_instance.extract_info.side_effect = [{'title': f'标题{i}'} for i in range(1, 4)]
+    first = VideoDownloader(console=console, download_path=str(tmp_path))
+
+    assert first.get_video_info("https://test.com/video")['title'] == '标题1'
+    assert first.get_video_info("https://test.com/video")['title'] == '标题1'
+    assert first.get_video_info("https://test.com/video", refresh=True)['title'] == '标题2'
+
+    second = VideoDownloader(console=console, download_path=str(tmp_path))
+    assert second.get_video_info("https://test.com/video")['title'] == '标题3'
+    assert mock_instance.extract_info.call_count == 3
+
+
+@pytest.mark.parametrize("seconds, expected", [
+    (30, "30秒"),          # 秒数
+    (90, "1分30秒"),       # 分钟
+    (3661, "1小时1分1秒"),  # 小时
+])
+def test_downloader_format_duration(downloader, seconds, expected):
+    """测试时长格式化"""
+    assert downloader._format_duration(seconds) == expected
+
+
+# ---------------------------------------------------------------------------
+# 音频解析器
+# ---------------------------------------------------------------------------
+
+def test_parser_init(parser, console):
+    """测试初始化"""
+    from parser.audio_parser import AudioParser
+    assert isinstance(parser, AudioParser)
+    assert parser.console == console
+
+
+def test_parser_configure(parser, shared_tmp):
+    """测试配置"""
+    parser.configure(
+        audio_output_dir=str(shared_tmp),
+        transcript_output_dir=str(shared_tmp),
+        model_size="base"
+    )
+    
+    assert str(parser.audio_output_dir) == str(shared_tmp)
+    assert str(parser.transcript_output_dir) == str(shared_tmp)
+    assert parser.model_size == "base"
+
+
+def test_parser_configure_failed_load_keeps_model(parser, monkeypatch):
+    """测试切换模型失败时解析器保持原来的模型和参数"""
+    before = (parser.backend, parser.model_size, parser.model)
+    monkeypatch.setattr('parser.audio_parser.AudioParser._get_model',
+                        Mock(side_effect=ImportError("No module named 'faster_whisper'")))
     
-    def setUp(self):
-        """测试前准备"""
-        self.console = Console(file=open('/dev/null', 'w'))  # 静默输出
-        self.downloader = VideoDownloader(console=self.console)
-        self.temp_dir = tempfile.mkdtemp()
-    
-    def tearDown(self):
-        """测试后清理"""
-        shutil.rmtree(self.temp_dir, ignore_errors=True)
-    
-    def test_init(self):
-        """测试初始化"""
-        self.assertIsInstance(self.downloader, VideoDownloader)
-        self.assertEqual(self.downloader.console, self.console)
-    
-    def test_configure_options(self):
-        """测试配置选项"""
-        self.downloader.configure_options(
-            output_path=self.temp_dir,
-            format_selector="best[height<=720]",
-            save_metadata=True
-        )
-        
-        # 验证配置是否正确设置
-        self.assertEqual(self.downloader.output_path, self.temp_dir)
-        self.assertEqual(self.downloader.format_selector, "best[height<=720]")
-        self.assertTrue(self.downloader.save_metadata)
-    
-    @patch('yt_dlp.YoutubeDL')
-    def test_get_video_info(self, mock_ytdl):
-        """测试获取视频信息"""
-        # 模拟返回数据
-        mock_info = {
-            'id': 'test_video_id',
-            'title': '测试视频标题',
-            'uploader': '测试作者',
-            'duration': 300,
-            'view_count': 10000,
-            'like_count': 500
-        }
-        
-        mock_instance = Mock()
-        mock_instance.extract_info.return_value = mock_info
-        mock_ytdl.return_value.__enter__.return_value = mock_instance
-        
-        # 执行测试
-        result = self.downloader.get_video_info("https://test.com/video")
-        
-        # 验证结果
-        self.assertEqual(result, mock_info)
-        mock_instance.extract_info.assert_called_once()
-    
-    def test_format_duration(self):
-        """测试时长格式化"""
-        # 测试秒数
-        self.assertEqual(self.downloader._format_duration(30), "30秒")
-        
-        # 测试分钟
-        self.assertEqual(self.downloader._format_duration(90), "1分30秒")
-        
-        # 测试小时
-        self.assertEqual(self.downloader._format_duration(3661), "1小时1分1秒")
+    with pytest.raises(ImportError):
+        parser.configure(model_size="small", backend="faster_whisper")
+    
+    assert (parser.backend, parser.model_size, parser.model) == before
 
 
-class TestAudioParser(unittest.TestCase):
-    """
-    测试音频解析器模块
-    """
+@pytest.mark.parametrize("seconds, expected", [
+    (65.5, "00:01:05,500"),      # 正常时间
+    (3665.123, "01:01:05,123"),  # 小时
+])
+def test_format_time_for_srt(parser, seconds, expected):
+    """测试SRT时间格式化"""
+    assert parser._format_time_for_srt(seconds) == expected
+
+
+SRT_SEGMENTS = [
+    {'start': 0.0, 'end': 2.5, 'text': '第一段文本'},
+    {'start': 2.5, 'end': 5.0, 'text': '第二段文本'}
+]
+SRT_ENTRIES = (
+    '1\n00:00:00,000 --> 00:00:02,500\n第一段文本',
+    '2\n00:00:02,500 --> 00:00:05,000\n第二段文本',
+)
+
+
+def test_generate_srt_content(parser):
+    """测试SRT内容生成"""
+    result = parser._generate_srt_content(SRT_SEGMENTS)
     
-    def setUp(self):
-        """测试前准备"""
-        self.console = Console(file=open('/dev/null', 'w'))
-        self.parser = AudioParser(console=self.console)
-        self.temp_dir = tempfile.mkdtemp()
-    
-    def tearDown(self):
-        """测试后清理"""
-        shutil.rmtree(self.temp_dir, ignore_errors=True)
-    
-    def test_init(self):
-        """测试初始化"""
-        self.assertIsInstance(self.parser, AudioParser)
-        self.assertEqual(self.parser.console, self.console)
-    
-    def test_configure(self):
-        """测试配置"""
-        self.parser.configure(
-            audio_output_dir=self.temp_dir,
-            transcript_output_dir=self.temp_dir,
-            model_size="base"
-        )
-        
-        self.assertEqual(str(self.parser.audio_output_dir), self.temp_dir)
-        self.assertEqual(str(self.parser.transcript_output_dir), self.temp_dir)
-        self.assertEqual(self.parser.model_size, "base")
-    
-    def test_format_time_for_srt(self):
-        """测试SRT时间格式化"""
-        # 测试正常时间
-        result = self.parser._format_time_for_srt(65.5)
-        self.assertEqual(result, "00:01:05,500")
-        
-        # 测试小时
-        result = self.parser._format_time_for_srt(3665.123)
-        self.assertEqual(result, "01:01:05,123")
-    
-    def test_generate_srt_content(self):
-        """测试SRT内容生成"""
-        segments = [
-            {'start': 0.0, 'end': 2.5, 'text': '第一段文本'},
-            {'start': 2.5, 'end': 5.0, 'text': '第二段文本'}
-        ]
-        
-        result = self.parser._generate_srt_content(segments)
-        
-        # 验证SRT格式
-        self.assertIn('1\n00:00:00,000 --> 00:00:02,500\n第一段文本', result)
-        self.assertIn('2\n00:00:02,500 --> 00:00:05,000\n第二段文本', result)
+    # 验证SRT格式
+    for entry in SRT_ENTRIES:
+        assert entry in result
+
+
+@patch('yt_dlp.YoutubeDL')
+def test_transcribe_from_url_in_memory(mock_ytdl, parser):
+    """测试不保存音频时直接解码音频流"""
+    mock_instance = Mock()
+    mock_instance.extract_info.return_value = {
+        'id': 'test_video_id',
+        'url': 'https://test.com/audio.m4a',
+        'http_headers': {'User-Agent': 'test'}
+    }
+    mock_ytdl.return_value.__enter__.return_value = mock_instance
+    
+    with patch.object(parser, '_decode_audio', return_value='audio') as mock_decode, \
+         patch.object(parser, 'transcribe_audio', return_value={'text': '', 'segments': []}) as mock_transcribe:
+        result = parser.transcribe_from_url("https://test.com/video", save_audio=False, save_transcript=False)
+    
+    mock_instance.extract_info.assert_called_once_with("https://test.com/video", download=False)
+    mock_decode.assert_called_once_with('https://test.com/audio.m4a', {'User-Agent': 'test'})
+    mock_transcribe.assert_called_once_with('audio')
+    assert 'audio_path' not in result
+
+
+@patch('yt_dlp.YoutubeDL')
+def test_transcribe_from_url_save_audio(mock_ytdl, parser, tmp_path):
+    """测试保存音频时下载到磁盘并复制到输出目录"""
+    def download(url, download):
+        outtmpl = mock_ytdl.call_args[0][0]['outtmpl']
+        Path(outtmpl).with_name('audio.wav').write_bytes(b'RIFF')
+        return {'id': 'test_video_id'}
+    
+    mock_instance = Mock()
+    mock_instance.extract_info.side_effect = download
+    mock_ytdl.return_value.__enter__.return_value = mock_instance
+    parser.configure(audio_output_dir=str(tmp_path))
+    
+    with patch.object(parser, 'transcribe_audio', return_value={'text': '', 'segments': []}):
+        result = parser.transcribe_from_url("https://test.com/video", save_audio=True, save_transcript=False)
+    
+    saved_path = tmp_path / 'test_video_id_audio.wav'
+    assert result['audio_path'] == str(saved_path)
+    assert saved_path.read_bytes() == b'RIFF'
+
 
+def test_transcribe_video_streaming_splits_at_silence(parser, monkeypatch):
+    """测试流式转写在静音处切分窗口，非中文文本以空格连接"""
+    import numpy as np
+    
+    rate = parser.VAD_SAMPLE_RATE
+    t = np.arange(70 * rate, dtype=np.float32) / rate
+    audio = (0.5 * np.sin(2 * np.pi * 440 * t)).astype(np.float32)
+    audio[int(27 * rate):int(27.3 * rate)] = 0  # 第一个窗口末尾的停顿
+    blocks = [audio[i:i + 5 * rate] for i in range(0, len(audio), 5 * rate)]
+    
+    windows = []
+    
+    def fake_transcribe(chunk, language, word_timestamps=False):
+        windows.append(len(chunk) / rate)
+        return f" word{len(windows)} ", 'en', [{'start': 0.0, 'end': len(chunk) / rate, 'text': 'x'}]
+    
+    monkeypatch.setattr(parser, 'cache_dir', None)
+    monkeypatch.setattr(parser, 'backend', 'whisper')
+    monkeypatch.setattr(parser, '_transcribe_openai_whisper', fake_transcribe)
+    monkeypatch.setattr(parser, '_stream_chunks', lambda video_path, audio_path=None: iter(blocks))
+    
+    result = parser.transcribe_video_streaming("video.mp4", language="en")
+    
+    # 第一个窗口在停顿处结束，其余音频并入后续窗口，总时长不变
+    assert 27.0 <= windows[0] <= 27.3
+    assert sum(windows) == pytest.approx(70)
+    assert result['segments'][1]['start'] == pytest.approx(windows[0])
+    assert result['text'] == " ".join(f"word{i}" for i in range(1, len(windows) + 1))
 
-class TestReportGenerator(unittest.TestCase):
+
+def test_transcribe_openai_whisper_accepts_path(parser, monkeypatch, tmp_path):
+    """测试 Path 类型的音频路径按文件路径传给 openai-whisper"""
+    model = Mock()
+    model.device.type = "cpu"
+    model.transcribe.return_value = {'text': '', 'language': 'zh', 'segments': []}
+    monkeypatch.setattr(parser, 'model', model)
+    monkeypatch.setattr(parser, 'vad', False)
+
+    parser._transcribe_openai_whisper(tmp_path / "audio.wav", "zh")
+
+    assert model.transcribe.call_args[0][0] == str(tmp_path / "audio.wav")
+
+
+def test_transcript_cache_path(parser, monkeypatch, tmp_path):
+    """测试转写缓存默认关闭，启用时缓存键随解码选项变化"""
+    assert parser.cache_dir is None
+
+    audio_path = tmp_path / "audio.wav"
+    audio_path.write_bytes(b"\0" * 4096)
+    monkeypatch.setattr(parser, 'cache_dir', tmp_path / "cache")
+    path = parser._transcript_cache_path(audio_path, "zh", False)
+
+    assert path.parent == tmp_path / "cache"
+    assert path == parser._transcript_cache_path(str(audio_path), "zh", False)
+    assert path != parser._transcript_cache_path(audio_path, "en", False)
+    monkeypatch.setattr(parser, 'vad', not parser.vad)
+    assert path != parser._transcript_cache_path(audio_path, "zh", False)
+
+
+# ---------------------------------------------------------------------------
+# 抖音批量下载器
+# ---------------------------------------------------------------------------
+
+AWEMES = [{'aweme_id': str(i), 'desc': f'作品{i}'} for i in range(8)]
+
+
+def _stub_aweme_download(fail_ids=(), delay=0.01):
     """
-    测试报告生成器模块
+    代替真实下载的 awemeDownload，记录调用顺序和同时进行的下载数
+    :param fail_ids: 下载时抛出异常的作品ID
+    :param delay: 每个作品的模拟下载耗时（秒）
+    :return: (替换用的协程函数, 调用记录字典)
     """
+    import asyncio
+
+    stats = {'order': [], 'active': 0, 'max_active': 0}
+
+    async def aweme_download(aweme, save_path):
+        stats['order'].append(aweme['aweme_id'])
+        stats['active'] += 1
+        stats['max_active'] = max(stats['max_active'], stats['active'])
+        try:
+            await asyncio.sleep(delay)
+            if aweme['aweme_id'] in fail_ids:
+                raise ConnectionError("连接被重置")
+            return True
+        finally:
+            stats['active'] -= 1
+
+    return aweme_download, stats
+
+
+def test_douyin_download_order_and_callback(console, tmp_path, monkeypatch):
+    """测试同一批次内按顺序下载，回调进度单调递增并以总数结束"""
+    from crawler.douyin_downloader import DouyinDownloader
+
+    progress = []
+    downloader = DouyinDownloader(console, progress_bar=False, thread=1,
+                                  callback=lambda done, total: progress.append((done, total)))
+    aweme_download, stats = _stub_aweme_download()
+    monkeypatch.setattr(downloader, 'awemeDownload', aweme_download)
+    monkeypatch.setattr(DouyinDownloader, 'PROGRESS_FLUSH_INTERVAL', 0)
+
+    assert downloader.download(AWEMES, tmp_path, batch_size=3) == len(AWEMES)
+
+    assert stats['order'] == [aweme['aweme_id'] for aweme in AWEMES]
+    assert [done for done, _ in progress] == sorted(done for done, _ in progress)
+    assert progress[-1] == (len(AWEMES), len(AWEMES))
+
+
+def test_douyin_download_concurrency_limit(console, tmp_path, monkeypatch):
+    """测试同时进行的下载数不超过 thread"""
+    from crawler.douyin_downloader import DouyinDownloader
+
+    downloader = DouyinDownloader(console, progress_bar=False, thread=2)
+    aweme_download, stats = _stub_aweme_download()
+    monkeypatch.setattr(downloader, 'awemeDownload', aweme_download)
+
+    downloader.download(AWEMES, tmp_path, batch_size=1)
+
+    assert stats['max_active'] == 2
+
+
+def test_douyin_download_failures(tmp_path, monkeypatch):
+    """测试下载失败的作品不计入成功数，并输出失败提示"""
+    from crawler.douyin_downloader import DouyinDownloader
+
+    buffer = io.StringIO()
+    downloader = DouyinDownloader(Console(file=buffer, width=200), progress_bar=False, thread=3)
+    aweme_download, _ = _stub_aweme_download(fail_ids={'2', '5'})
+    monkeypatch.setattr(downloader, 'awemeDownload', aweme_download)
+
+    assert downloader.download(AWEMES, tmp_path, batch_size=2) == len(AWEMES) - 2
+    assert "作品2 - 连接被重置" in buffer.getvalue()
+    assert "作品5 - 连接被重置" in buffer.getvalue()
+
+
+def test_douyin_download_inside_event_loop(console, tmp_path, monkeypatch):
+    """测试在运行中的事件循环里调用同步接口不会报错"""
+    import asyncio
+    from crawler.douyin_downloader import DouyinDownloader
+
+    downloader = DouyinDownloader(console, progress_bar=False)
+    aweme_download, _ = _stub_aweme_download()
+    monkeypatch.setattr(downloader, 'awemeDownload', aweme_download)
+
+    async def call_from_coroutine():
+        return downloader.download(AWEMES, tmp_path)
+
+    assert asyncio.run(call_from_coroutine()) == len(AWEMES)
+
+
+# ---------------------------------------------------------------------------
+# 报告生成器
+# ---------------------------------------------------------------------------
+
+# 模拟数据
+MOCK_VIDEO_INFO = {
+    'id': 'test_video',
+    'title': '测试视频标题',
+    'uploader': '测试作者',
+    'duration': 300,
+    'view_count': 10000,
+    'like_count': 500,
+    'upload_date': '20240101'
+}
+
+MOCK_TRANSCRIPTION = {
+    'text': '这是一个测试视频的完整转写文本。',
+    'language': 'zh',
+    'segments': [
+        {'start': 0.0, 'end': 2.0, 'text': '你知道什么样的开头'},
+        {'start': 2.0, 'end': 4.0, 'text': '能让观众看完整个视频吗？'},
+        {'start': 4.0, 'end': 6.0, 'text': '今天我来告诉你秘密。'}
+    ]
+}
+
+HOOK_QUESTION_LABEL = '疑问式钩子'
+
+# Markdown 报告中应出现的内容，按字节预先编码，直接在读取的文件字节中查找
+MD_REPORT_MARKERS = tuple(text.encode() for text in (
+    '# 视频分析报告', MOCK_VIDEO_INFO['title'], HOOK_QUESTION_LABEL
+))
+
+# 各钩子类型的样例片段，新增类型时加一行即可
+HOOK_SAMPLES = {
+    'question': MOCK_TRANSCRIPTION['segments'],
+    'reversal': [
+        {'start': 0.0, 'end': 2.5, 'text': '大家都以为早起最健康'},
+        {'start': 2.5, 'end': 5.0, 'text': '其实并不是这样。'}
+    ],
+    'value': [{'start': 0.0, 'end': 3.0, 'text': '三个拍照技巧分享给你。'}],
+    'shock': [{'start': 0.0, 'end': 2.0, 'text': '这个结果太厉害了！'}],
+    'unknown': [{'start': 0.0, 'end': 2.0, 'text': '大家好，欢迎来到我的频道。'}],
+    'none': [{'start': 4.0, 'end': 6.0, 'text': '开头三秒没有内容。'}],
+}
+
+
+def test_reporter_init(reporter, console):
+    """测试初始化"""
+    from report.report_generator import ReportGenerator
+    assert isinstance(reporter, ReportGenerator)
+    assert reporter.console == console
+
+
+@pytest.mark.parametrize("seconds, expected", [
+    (30, "30.0秒"),
+    (90, "1分30秒"),
+    (3661, "1小时1分钟"),
+])
+def test_reporter_format_duration(reporter, seconds, expected):
+    """测试时长格式化"""
+    assert reporter._format_duration(seconds) == expected
+
+
+@pytest.mark.parametrize("seconds, expected", [
+    (65, "01:05"),
+    (125, "02:05"),
+])
+def test_format_time(reporter, seconds, expected):
+    """测试时间戳格式化"""
+    assert reporter._format_time(seconds) == expected
+
+
+@pytest.mark.parametrize("number, expected", [
+    (5000, "5000"),
+    (15000, "1.5万"),
+    ("N/A", "N/A"),
+])
+def test_format_number(reporter, number, expected):
+    """测试数字格式化"""
+    assert reporter._format_number(number) == expected
+
+
+def test_extract_hook_content(reporter):
+    """测试钩子内容提取"""
+    result = reporter._extract_hook_content(MOCK_TRANSCRIPTION['segments'])
     
-    def setUp(self):
-        """测试前准备"""
-        self.console = Console(file=open('/dev/null', 'w'))
-        self.reporter = ReportGenerator(console=self.console)
-        self.temp_dir = tempfile.mkdtemp()
-        
-        # 模拟数据
-        self.mock_video_info = {
-            'id': 'test_video',
-            'title': '测试视频标题',
-            'uploader': '测试作者',
-            'duration': 300,
-            'view_count': 10000,
-            'like_count': 500,
-            'upload_date': '20240101'
-        }
-        
-        self.mock_transcription = {
-            'text': '这是一个测试视频的完整转写文本。',
-            'language': 'zh',
-            'segments': [
-                {'start': 0.0, 'end': 2.0, 'text': '你知道什么样的开头'},
-                {'start': 2.0, 'end': 4.0, 'text': '能让观众看完整个视频吗？'},
-                {'start': 4.0, 'end': 6.0, 'text': '今天我来告诉你秘密。'}
-            ]
-        }
-    
-    def tearDown(self):
-        """测试后清理"""
-        shutil.rmtree(self.temp_dir, ignore_errors=True)
-    
-    def test_init(self):
-        """测试初始化"""
-        self.assertIsInstance(self.reporter, ReportGenerator)
-        self.assertEqual(self.reporter.console, self.console)
-    
-    def test_format_duration(self):
-        """测试时长格式化"""
-        self.assertEqual(self.reporter._format_duration(30), "30.0秒")
-        self.assertEqual(self.reporter._format_duration(90), "1分30秒")
-        self.assertEqual(self.reporter._format_duration(3661), "1小时1分钟")
-    
-    def test_format_time(self):
-        """测试时间戳格式化"""
-        self.assertEqual(self.reporter._format_time(65), "01:05")
-        self.assertEqual(self.reporter._format_time(125), "02:05")
-    
-    def test_format_number(self):
-        """测试数字格式化"""
-        self.assertEqual(self.reporter._format_number(5000), "5000")
-        self.assertEqual(self.reporter._format_number(15000), "1.5万")
-        self.assertEqual(self.reporter._format_number("N/A"), "N/A")
-    
-    def test_extract_hook_content(self):
-        """测试钩子内容提取"""
-        result = self.reporter._extract_hook_content(self.mock_transcription['segments'])
-        
-        # 验证钩子类型识别
-        self.assertIn("疑问式钩子", result)
-        self.assertIn("你知道什么样的开头能让观众看完整个视频吗？", result)
-    
-    def test_analyze_hook(self):
-        """测试钩子分析"""
-        result = self.reporter._analyze_hook(self.mock_transcription['segments'])
-        
-        self.assertEqual(result['type'], 'question')
-        self.assertIn('你知道', result['content'])
-        self.assertEqual(result['duration'], 4.0)
+    # 验证钩子类型识别
+    assert HOOK_QUESTION_LABEL in result
+    assert "你知道什么样的开头能让观众看完整个视频吗？" in result
+
+
+@pytest.fixture(scope="module", params=list(HOOK_SAMPLES))
+def hook_sample(request):
+    """(钩子类型, 样例片段)，同一模块内每种类型的片段列表只构建一次"""
+    return request.param, HOOK_SAMPLES[request.param]
+
+
+def test_analyze_hook(reporter, hook_sample):
+    """测试各类型钩子的识别"""
+    hook_type, segments = hook_sample
+    result = reporter._analyze_hook(segments)
+    
+    assert result['type'] == hook_type
+    if hook_type == 'none':
+        assert result['content'] == ''
+    else:
+        assert segments[0]['text'] in result['content']
+
+
+def test_analyze_hook_question_details(reporter):
+    """测试钩子分析的内容和时长"""
+    result = reporter._analyze_hook(MOCK_TRANSCRIPTION['segments'])
     
-    def test_generate_markdown_report(self):
-        """测试Markdown报告生成"""
-        output_path = Path(self.temp_dir) / "test_report.md"
-        
-        result_path = self.reporter.generate_markdown_report(
-            self.mock_video_info,
-            self.mock_transcription,
-            str(output_path)
-        )
-        
-        # 验证文件生成
-        self.assertTrue(Path(result_path).exists())
-        
-        # 验证内容
-        with open(result_path, 'r', encoding='utf-8') as f:
-            content = f.read()
-            self.assertIn('# 视频分析报告', content)
-            self.assertIn('测试视频标题', content)
-            self.assertIn('疑问式钩子', content)
-    
-    def test_generate_json_report(self):
-        """测试JSON报告生成"""
-        output_path = Path(self.temp_dir) / "test_data.json"
-        
-        result_path = self.reporter.generate_json_report(
-            self.mock_video_info,
-            self.mock_transcription,
-            str(output_path)
-        )
-        
-        # 验证文件生成
-        self.assertTrue(Path(result_path).exists())
-        
-        # 验证JSON结构
-        with open(result_path, 'r', encoding='utf-8') as f:
-            data = json.load(f)
-            self.assertIn('basic_info', data)
-            self.assertIn('transcription', data)
-            self.assertIn('analysis', data)
-            self.assertEqual(data['analysis']['hook_analysis']['type'], 'question')
+    assert result['type'] == 'question'
+    assert '你知道' in result['content']
+    assert result['duration'] == 4.0
 
 
-class TestBVSAnalyzer(unittest.TestCase):
-    """
-    测试主分析器类
-    """
+def test_extract_hook_label(reporter, hook_sample):
+    """测试钩子内容提取中的类型名称"""
+    from report.report_generator import HOOK_TYPE_LABELS
     
-    def setUp(self):
-        """测试前准备"""
-        self.temp_dir = tempfile.mkdtemp()
-        self.analyzer = BVSAnalyzer(output_dir=self.temp_dir)
-    
-    def tearDown(self):
-        """测试后清理"""
-        shutil.rmtree(self.temp_dir, ignore_errors=True)
-    
-    def test_init(self):
-        """测试初始化"""
-        self.assertIsInstance(self.analyzer, BVSAnalyzer)
-        self.assertTrue(self.analyzer.output_dir.exists())
-        self.assertTrue(self.analyzer.video_dir.exists())
-        self.assertTrue(self.analyzer.audio_dir.exists())
-        self.assertTrue(self.analyzer.transcripts_dir.exists())
-        self.assertTrue(self.analyzer.reports_dir.exists())
-    
-    @patch.object(VideoDownloader, 'get_video_info')
-    @patch.object(VideoDownloader, 'download_video')
-    @patch.object(AudioParser, 'transcribe_from_url')
-    @patch.object(ReportGenerator, 'generate_markdown_report')
-    @patch.object(ReportGenerator, 'generate_json_report')
-    def test_analyze_single_video_success(self, mock_json_report, mock_md_report, 
-                                        mock_transcribe, mock_download, mock_info):
-        """测试单个视频分析成功流程"""
-        # 设置模拟返回值
-        mock_info.return_value = {'id': 'test', 'title': '测试视频'}
-        mock_download.return_value = '/path/to/video.mp4'
-        mock_transcribe.return_value = {'text': '测试转写', 'segments': []}
-        mock_md_report.return_value = '/path/to/report.md'
-        mock_json_report.return_value = '/path/to/data.json'
-        
-        # 执行测试
-        result = self.analyzer.analyze_single_video("https://test.com/video")
-        
-        # 验证结果
-        self.assertTrue(result['success'])
-        self.assertIn('video_info', result)
-        self.assertIn('transcription', result)
-        self.assertIn('report_paths', result)
-        
-        # 验证方法调用
-        mock_info.assert_called_once()
+    hook_type, segments = hook_sample
+    result = reporter._extract_hook_content(segments)
+    
+    if hook_type == 'none':
+        assert "未检测到" in result
+    else:
+        assert HOOK_TYPE_LABELS[hook_type] in result
+
+
+def test_generate_markdown_report(reporter, tmp_path):
+    """测试Markdown报告生成"""
+    output_path = tmp_path / "test_report.md"
+    
+    result_path = reporter.generate_markdown_report(
+        MOCK_VIDEO_INFO,
+        MOCK_TRANSCRIPTION,
+        str(output_path)
+    )
+    
+    # 直接读取验证内容，文件未生成时 read_bytes 抛出 FileNotFoundError
+    content = Path(result_path).read_bytes()
+    assert content, "报告文件为空"
+    for marker in MD_REPORT_MARKERS:
+        assert marker in content
+
+
+def test_generate_json_report(reporter):
+    """测试JSON报告生成"""
+    # 写入内存缓冲区，不经过磁盘
+    buffer = io.BytesIO()
+    result = reporter.generate_json_report(
+        MOCK_VIDEO_INFO,
+        MOCK_TRANSCRIPTION,
+        buffer
+    )
+    assert result is buffer
+    
+    # 验证JSON结构
+    data = json.loads(buffer.getvalue())
+    assert 'basic_info' in data
+    assert 'transcription' in data
+    assert 'analysis' in data
+    assert data['analysis']['hook_analysis']['type'] == 'question'
+
+
+# ---------------------------------------------------------------------------
+# 主分析器
+# ---------------------------------------------------------------------------
+
+@pytest.mark.parametrize("url, expected", [
+    ("https://www.tiktok.com/@user", True),
+    ("https://www.youtube.com/@channel/videos", True),
+    ("https://www.youtube.com/playlist?list=PL123", True),
+    ("https://www.tiktok.com/@user/video/123", False),
+    ("https://www.youtube.com/watch?v=dQw4w9WgXcQ", False),
+])
+def test_is_playlist_url(url, expected):
+    """测试多视频链接识别：频道主页需要展开，单个视频链接直接分析"""
+    from main import _is_playlist_url
+    assert _is_playlist_url(url) == expected
+
+
+@patch('yt_dlp.YoutubeDL')
+def test_list_entries_expands_channel_tabs(mock_ytdl, downloader):
+    """测试频道主页展开到各标签页中的视频，嵌套播放列表一并展开"""
+    pages = {
+        "https://www.youtube.com/@channel": {'entries': [
+            {'_type': 'url', 'ie_key': 'YoutubeTab', 'url': "https://www.youtube.com/@channel/videos"},
+            {'_type': 'playlist', 'entries': [{'_type': 'url', 'ie_key': 'Youtube', 'url': "v3"}]},
+        ]},
+        "https://www.youtube.com/@channel/videos": {'entries': [
+            {'_type': 'url', 'ie_key': 'Youtube', 'url': "v1"},
+            {'_type': 'url', 'ie_key': 'Youtube', 'url': "v2"},
+        ]},
+    }
+    mock_instance = mock_ytdl.return_value.__enter__.return_value
+    mock_instance.extract_info.side_effect = lambda url, download: pages[url]
+
+    assert downloader.list_entries("https://www.youtube.com/@channel") == ["v1", "v2", "v3"]
+
+
+def test_batch_expands_every_playlist(tmp_path, monkeypatch):
+    """测试批量分析展开输入中的每个播放列表链接，单个视频链接保持不变"""
+    from main import BVSAnalyzer
+
+    analyzer = BVSAnalyzer(output_dir=str(tmp_path), quiet=True)
+    playlists = {
+        "https://www.youtube.com/playlist?list=PL1": ["https://a.test/1", "https://a.test/2"],
+        "https://www.youtube.com/@channel/videos": ["https://a.test/3"],
+    }
+    analyzed = []
+    monkeypatch.setattr(analyzer.downloader, 'list_entries', lambda url: playlists[url])
+    monkeypatch.setattr(analyzer, 'analyze_single_video',
+                        lambda url, *args, **kwargs: analyzed.append(url) or {'success': True})
+
+    analyzer.analyze_batch_videos(["https://www.youtube.com/playlist?list=PL1", "https://a.test/0",
+                                   "https://www.youtube.com/@channel/videos"])
+
+    assert analyzed == ["https://a.test/1", "https://a.test/2", "https://a.test/0", "https://a.test/3"]
+
+
+def test_analyzer_init(analyzer):
+    """测试初始化"""
+    from main import BVSAnalyzer
+    assert isinstance(analyzer, BVSAnalyzer)
+    
+    # 一次遍历输出目录，对比子目录集合
+    names = {entry.name for entry in os.scandir(analyzer.output_dir) if entry.is_dir()}
+    expected = {d.name for d in (analyzer.video_dir, analyzer.audio_dir,
+                                 analyzer.transcripts_dir, analyzer.reports_dir)}
+    assert expected <= names
+
+
+def test_analyzer_loads_parser_lazily(tmp_path):
+    """测试分析器创建时不加载 Whisper 模型，进程池批量分析的主进程无需持有模型"""
+    from main import BVSAnalyzer
+
+    analyzer = BVSAnalyzer(output_dir=str(tmp_path), quiet=True, cache_transcripts=True)
+
+    assert analyzer._parser is None
+    assert analyzer.transcript_cache_dir == tmp_path / ".transcript_cache"
+
+
+@pytest.mark.parametrize("info_result, expect_success, expect_error", [
+    ({'id': 'test', 'title': '测试视频'}, True, None),
+    (Exception("网络错误"), False, "网络错误"),
+], ids=["success", "failure"])
+def test_analyze_single_video(analyzer, clean_reports, monkeypatch,
+                              info_result, expect_success, expect_error):
+    """测试单个视频分析的成功和失败流程"""
+    # 在函数体内打补丁，测试结束时由 monkeypatch 统一还原；
+    # 异常作为 side_effect 抛出，其余作为返回值
+    if isinstance(info_result, Exception):
+        mock_info = Mock(side_effect=info_result)
+    else:
+        mock_info = Mock(return_value=info_result)
+    mock_download = Mock(return_value='/path/to/video.mp4')
+    mock_transcribe = Mock(return_value={'text': '测试转写', 'segments': []})
+    mock_md_report = Mock(return_value='/path/to/report.md')
+    mock_json_report = Mock(return_value='/path/to/data.json')
+    monkeypatch.setattr('crawler.video_downloader.VideoDownloader.get_video_info', mock_info)
+    monkeypatch.setattr('crawler.video_downloader.VideoDownloader.download_video', mock_download)
+    monkeypatch.setattr('parser.audio_parser.AudioParser.transcribe_from_url', mock_transcribe)
+    monkeypatch.setattr('report.report_generator.ReportGenerator.generate_markdown_report', mock_md_report)
+    monkeypatch.setattr('report.report_generator.ReportGenerator.generate_json_report', mock_json_report)
+    
+    # 执行测试
+    result = analyzer.analyze_single_video("https://test.com/video")
+    
+    # 验证结果
+    assert result['success'] == expect_success
+    mock_info.assert_called_once()
+    
+    if expect_success:
+        assert 'video_info' in result
+        assert 'transcription' in result
+        assert 'report_paths' in result
+        
+        # 验证后续步骤均已执行
         mock_download.assert_called_once()
         mock_transcribe.assert_called_once()
         mock_md_report.assert_called_once()
         mock_json_report.assert_called_once()
-    
-    @patch.object(VideoDownloader, 'get_video_info')
-    def test_analyze_single_video_failure(self, mock_info):
-        """测试单个视频分析失败流程"""
-        # 设置模拟异常
-        mock_info.side_effect = Exception("网络错误")
-        
-        # 执行测试
-        result = self.analyzer.analyze_single_video("https://test.com/video")
-        
-        # 验证结果
-        self.assertFalse(result['success'])
-        self.assertIn('error', result)
-        self.assertEqual(result['error'], "网络错误")
+    else:
+        assert result['error'] == expect_error
+        mock_download.assert_not_called()
+
+
+def test_analyze_single_video_async_info_failure(tmp_path, monkeypatch):
+    """测试异步分析获取视频信息失败时不启动下载和转写"""
+    import asyncio
+    from main import BVSAnalyzer
+
+    analyzer = BVSAnalyzer(output_dir=str(tmp_path), quiet=True)
+    mock_download = Mock()
+    mock_transcribe = Mock()
+    monkeypatch.setattr(analyzer, '_fetch_video_info', Mock(side_effect=Exception("网络错误")))
+    monkeypatch.setattr(analyzer, '_download_video', mock_download)
+    monkeypatch.setattr(analyzer, '_transcribe', mock_transcribe)
+
+    result = asyncio.run(analyzer.analyze_single_video_async("https://test.com/video", quiet=True))
+
+    assert result == {'success': False, 'error': "网络错误"}
+    mock_download.assert_not_called()
+    mock_transcribe.assert_not_called()
+
+
+def test_analyze_single_video_async_waits_for_siblings(tmp_path, monkeypatch):
+    """测试转写失败时等下载线程结束后才返回失败结果"""
+    import asyncio
+    from main import BVSAnalyzer
 
+    analyzer = BVSAnalyzer(output_dir=str(tmp_path), quiet=True)
+    finished = []
 
-class TestIntegration(unittest.TestCase):
+    def slow_download(url):
+        time.sleep(0.2)
+        finished.append(url)
+        return None
+
+    monkeypatch.setattr(analyzer, '_fetch_video_info', Mock(return_value={'title': '测试视频'}))
+    monkeypatch.setattr(analyzer, '_download_video', slow_download)
+    monkeypatch.setattr(analyzer, '_transcribe', Mock(side_effect=Exception("音频转写失败")))
+
+    result = asyncio.run(analyzer.analyze_single_video_async("https://test.com/video", quiet=True))
+
+    assert result['error'] == "音频转写失败"
+    assert finished == ["https://test.com/video"]
+
+
+# ---------------------------------------------------------------------------
+# 抖音链接功能测试（需联网）
+# ---------------------------------------------------------------------------
+
+def _analyze_douyin(analyzer) -> dict:
     """
-    集成测试 - 测试模块间协作
+    分析抖音测试链接，仅转写，不下载视频以节省时间
+    :param analyzer: BVSAnalyzer 实例
+    :return: 分析结果字典
     """
-    
-    def setUp(self):
-        """测试前准备"""
-        self.temp_dir = tempfile.mkdtemp()
-    
-    def tearDown(self):
-        """测试后清理"""
-        shutil.rmtree(self.temp_dir, ignore_errors=True)
-    
-    def test_module_integration(self):
-        """测试模块集成"""
-        console = Console(file=open('/dev/null', 'w'))
-        
-        # 创建各模块实例
-        downloader = VideoDownloader(console=console)
-        parser = AudioParser(console=console)
-        reporter = ReportGenerator(console=console)
-        
-        # 验证模块可以正常协作
-        self.assertIsInstance(downloader, VideoDownloader)
-        self.assertIsInstance(parser, AudioParser)
-        self.assertIsInstance(reporter, ReportGenerator)
-        
-        # 测试配置传递
-        downloader.configure_options(output_path=self.temp_dir)
-        parser.configure(audio_output_dir=self.temp_dir)
-        
-        self.assertEqual(downloader.output_path, self.temp_dir)
-        self.assertEqual(str(parser.audio_output_dir), self.temp_dir)
+    return analyzer.analyze_single_video(DOUYIN_TEST_URL, download_video=False, generate_report=True)
+
+
+# 联网测试偶发超时，安装 pytest-rerunfailures 后失败时等待片刻重跑
+NETWORK_FLAKY = pytest.mark.flaky(reruns=2, reruns_delay=5)
+
+
+@pytest.fixture(scope="module")
+def douyin_result(analyzer):
+    """
+    抖音链接的分析结果，同一模块内只联网分析一次，各项断言共用
+    分析失败时抛出异常而不缓存失败结果，重跑时重新分析
+    """
+    result = _analyze_douyin(analyzer)
+    if not result['success']:
+        pytest.fail(f"抖音链接分析失败: {result.get('error')}")
+    return result
+
+
+@pytest.mark.network
+@NETWORK_FLAKY
+def test_douyin_analysis(douyin_result):
+    """测试抖音链接分析成功"""
+    assert douyin_result['success']
+
+
+@pytest.mark.network
+@NETWORK_FLAKY
+def test_douyin_title(douyin_result):
+    """测试获取到视频标题"""
+    assert douyin_result['video_info'].get('title')
+
+
+@pytest.mark.network
+@NETWORK_FLAKY
+def test_douyin_transcription(douyin_result):
+    """测试转写结果包含文本"""
+    assert 'text' in douyin_result['transcription']
+
+
+@pytest.mark.network
+@NETWORK_FLAKY
+def test_douyin_report_paths(douyin_result):
+    """测试报告文件已生成"""
+    for path in douyin_result['report_paths'].values():
+        assert Path(path).stat().st_size > 0
 
 
 def run_douyin_test():
@@ -372,36 +781,31 @@ def run_douyin_test():
     console = Console()
     
     console.print("\n🧪 [bold blue]开始抖音链接功能测试[/bold blue]")
-    console.print("链接: https://www.douyin.com/jingxuan?modal_id=7526877413813292329")
+    console.print(f"链接: {DOUYIN_TEST_URL}")
     
     try:
-        # 创建临时测试目录
-        test_dir = tempfile.mkdtemp(prefix="bvs_test_")
-        console.print(f"测试目录: {test_dir}")
-        
-        # 创建分析器
-        analyzer = BVSAnalyzer(output_dir=test_dir)
-        
-        # 执行分析（仅转写，不下载视频以节省时间）
-        console.print("\n📝 [yellow]开始分析（仅转写模式）...[/yellow]")
-        result = analyzer.analyze_single_video(
-            "https://www.douyin.com/jingxuan?modal_id=7526877413813292329",
-            download_video=False,  # 不下载视频文件
-            generate_report=True
-        )
-        
-        if result['success']:
-            console.print("\n✅ [green]抖音链接测试成功！[/green]")
-            console.print(f"视频标题: {result['video_info'].get('title', 'N/A')}")
-            console.print(f"转写文本长度: {len(result['transcription'].get('text', ''))} 字符")
-            console.print(f"报告文件: {result['report_paths']}")
-        else:
-            console.print(f"\n❌ [red]抖音链接测试失败: {result['error']}[/red]")
-        
-        # 清理测试目录
-        shutil.rmtree(test_dir, ignore_errors=True)
-        
-        return result['success']
+        from main import BVSAnalyzer
+        
+        # 临时测试目录在退出时自动清理，分析异常时也不会残留
+        with tempfile.TemporaryDirectory(prefix="bvs_test_") as test_dir:
+            console.print(f"测试目录: {test_dir}")
+            
+            # 创建分析器
+            analyzer = BVSAnalyzer(output_dir=test_dir)
+            
+            # 执行分析（仅转写模式）
+            console.print("\n📝 [yellow]开始分析（仅转写模式）...[/yellow]")
+            result = _analyze_douyin(analyzer)
+            
+            if result['success']:
+                console.print("\n✅ [green]抖音链接测试成功！[/green]")
+                console.print(f"视频标题: {result['video_info'].get('title', 'N/A')}")
+                console.print(f"转写文本长度: {len(result['transcription'].get('text', ''))} 字符")
+                console.print(f"报告文件: {result['report_paths']}")
+            else:
+                console.print(f"\n❌ [red]抖音链接测试失败: {result['error']}[/red]")
+            
+            return result['success']
         
     except Exception as e:
         console.print(f"\n💥 [red]测试过程中发生异常: {str(e)}[/red]")
@@ -415,32 +819,18 @@ if __name__ == '__main__':
     console.print("\n🧪 [bold blue]BVS Analyzer 单元测试套件[/bold blue]")
     console.print("=" * 50)
     
-    # 创建测试套件
-    test_suite = unittest.TestSuite()
-    
-    # 添加测试类
-    test_classes = [
-        TestVideoDownloader,
-        TestAudioParser, 
-        TestReportGenerator,
-        TestBVSAnalyzer,
-        TestIntegration
-    ]
-    
-    for test_class in test_classes:
-        tests = unittest.TestLoader().loadTestsFromTestCase(test_class)
-        test_suite.addTests(tests)
-    
-    # 运行测试
-    runner = unittest.TextTestRunner(verbosity=2)
-    result = runner.run(test_suite)
+    # 运行测试，已安装 pytest-xdist 时多进程并行；需联网的抖音测试由下方单独运行
+    pytest_args = [__file__, "-v", "-m", "not network"]
+    if is_installed("pytest-xdist"):
+        pytest_args += ["-n", "auto", "--dist=loadscope"]
+    unit_success = pytest.main(pytest_args) == 0
     
     # 显示测试结果
     console.print("\n" + "=" * 50)
-    if result.wasSuccessful():
+    if unit_success:
         console.print("✅ [green]所有单元测试通过！[/green]")
     else:
-        console.print(f"❌ [red]测试失败: {len(result.failures)} 个失败, {len(result.errors)} 个错误[/red]")
+        console.print("❌ [red]单元测试未全部通过，详见上方 pytest 输出[/red]")
     
     # 运行抖音链接功能测试
     console.print("\n" + "=" * 50)
@@ -449,10 +839,10 @@ if __name__ == '__main__':
     # 最终总结
     console.print("\n" + "=" * 50)
     console.print("📊 [bold]测试总结[/bold]")
-    console.print(f"单元测试: {'✅ 通过' if result.wasSuccessful() else '❌ 失败'}")
+    console.print(f"单元测试: {'✅ 通过' if unit_success else '❌ 失败'}")
     console.print(f"功能测试: {'✅ 通过' if douyin_success else '❌ 失败'}")
     
-    if result.wasSuccessful() and douyin_success:
+    if unit_success and douyin_success:
         console.print("\n🎉 [bold green]所有测试通过，第一阶段功能验证完成！[/bold green]")
     else:
-        console.print("\n⚠️ [bold yellow]部分测试未通过，请检查相关功能。[/bold yellow]")
\ No newline at end of file
+        console.print("\n⚠️ [bold yellow]部分测试未通过，请检查相关功能。[/bold yellow]")
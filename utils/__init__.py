@@ -0,0 +1 @@
+# Utilities module
\ No newline at end of file
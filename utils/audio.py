@@ -0,0 +1,25 @@
+import wave
+from pathlib import Path
+
+
+def make_sine_wav(directory: str, seconds: float = 1.0, frequency: float = 440.0) -> str:
+    """
+    生成确定性的正弦波 WAV 文件（16kHz 单声道），测试中代替真实音频
+    :param directory: 输出目录
+    :param seconds: 时长（秒）
+    :param frequency: 频率（Hz）
+    :return: WAV 文件路径
+    """
+    import numpy as np
+    
+    sample_rate = 16000
+    t = np.arange(int(sample_rate * seconds)) / sample_rate
+    samples = (0.3 * 32767 * np.sin(2 * np.pi * frequency * t)).astype(np.int16)
+    
+    wav_path = Path(directory) / "synthetic_sine.wav"
+    with wave.open(str(wav_path), 'wb') as f:
+        f.setnchannels(1)
+        f.setsampwidth(2)
+        f.setframerate(sample_rate)
+        f.writeframes(samples.tobytes())
+    return str(wav_path)
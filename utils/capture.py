@@ -0,0 +1,32 @@
+import io
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, List, Tuple
+from rich.console import Console
+
+
+def run_captured(test_func: Callable, console: Console) -> tuple:
+    """
+    在缓冲区 Console 上运行测试，输出暂存起来，由调用方决定何时打印
+    :param test_func: 接受 console 参数的测试函数
+    :param console: 主 Console，缓冲区沿用其终端能力和宽度
+    :return: (是否通过, 异常对象或None, 测试输出)
+    """
+    buffer = io.StringIO()
+    capture = Console(file=buffer, force_terminal=console.is_terminal,
+                      color_system=console.color_system, width=console.width)
+    try:
+        return test_func(capture), None, buffer.getvalue()
+    except Exception as e:
+        return False, e, buffer.getvalue()
+
+
+def run_captured_parallel(tests: List[Tuple[str, Callable]], console: Console) -> List[tuple]:
+    """
+    并行运行互不依赖的测试，各测试输出到独立缓冲区，避免多线程输出交错
+    :param tests: (测试名称, 接受 console 参数的测试函数) 列表
+    :param console: 主 Console
+    :return: 与输入顺序一致的 (测试名称, 是否通过, 异常对象或None, 测试输出) 列表
+    """
+    with ThreadPoolExecutor(max_workers=len(tests)) as executor:
+        futures = [executor.submit(run_captured, test_func, console) for _, test_func in tests]
+        return [(test_name, *future.result()) for (test_name, _), future in zip(tests, futures)]
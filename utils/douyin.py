@@ -0,0 +1,34 @@
+import re
+
+
+# 抖音链接中的 modal_id 参数（精选页、搜索页等弹窗播放的视频）
+MODAL_RE = re.compile(r'[?&]modal_id=(\d+)')
+
+# 标准化后的抖音视频链接
+VIDEO_RE = re.compile(r'^https://www\.douyin\.com/video/(\d+)$')
+
+# 抖音网页端链接
+_PAGE_RE = re.compile(r'^https?://(?:www\.)?douyin\.com/')
+
+
+def normalize_url(url: str) -> str:
+    """
+    将带 modal_id 的抖音链接转换为 yt-dlp 支持的标准视频链接
+    :param url: 原始视频URL
+    :return: 标准化后的URL，无需转换时原样返回
+    """
+    if _PAGE_RE.match(url):
+        match = MODAL_RE.search(url)
+        if match:
+            return f"https://www.douyin.com/video/{match.group(1)}"
+    return url
+
+
+def video_id(url: str):
+    """
+    从标准化后的抖音视频链接中提取数字ID
+    :param url: 标准化后的视频URL
+    :return: 视频ID，非抖音视频链接返回None
+    """
+    match = VIDEO_RE.match(url)
+    return match.group(1) if match else None
@@ -0,0 +1,60 @@
+import json
+from pathlib import Path
+from typing import Any, BinaryIO, Union
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+def write_json(path: Union[str, Path, BinaryIO], data: Any, indent: bool = True):
+    """
+    将数据写入 JSON 文件（UTF-8，中文不转义）
+    已安装 orjson 时用其 C 实现一次编码为字节写入，否则回退到标准库 json
+    :param path: 输出路径，或以二进制方式写入的文件对象（如 io.BytesIO）
+    :param data: 要保存的数据
+    :param indent: 是否以两个空格缩进输出，为False时输出紧凑格式
+    """
+    if hasattr(path, 'write'):
+        path.write(_dumps(data, indent))
+        return
+
+    if orjson is not None:
+        Path(path).write_bytes(_dumps(data, indent))
+        return
+
+    with open(path, 'w', encoding='utf-8', buffering=1 << 20) as f:
+        if indent:
+            json.dump(data, f, ensure_ascii=False, indent=2)
+        else:
+            json.dump(data, f, ensure_ascii=False, separators=(',', ':'))
+
+
+def _dumps(data: Any, indent: bool) -> bytes:
+    """
+    将数据编码为 UTF-8 JSON 字节
+    :param data: 要编码的数据
+    :param indent: 是否缩进
+    :return: JSON 字节串
+    """
+    if orjson is not None:
+        option = orjson.OPT_NON_STR_KEYS
+        if indent:
+            option |= orjson.OPT_INDENT_2
+        return orjson.dumps(data, option=option)
+    if indent:
+        return json.dumps(data, ensure_ascii=False, indent=2).encode('utf-8')
+    return json.dumps(data, ensure_ascii=False, separators=(',', ':')).encode('utf-8')
+
+
+def read_json(path: Union[str, Path]) -> Any:
+    """
+    读取 JSON 文件，已安装 orjson 时用其解析
+    :param path: 文件路径
+    :return: 解析后的数据
+    """
+    if orjson is not None:
+        return orjson.loads(Path(path).read_bytes())
+    with open(path, 'r', encoding='utf-8') as f:
+        return json.load(f)
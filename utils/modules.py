@@ -0,0 +1,47 @@
+import re
+import functools
+import importlib.metadata
+from pathlib import Path
+from typing import List, Union
+
+
+def _normalize(name: str) -> str:
+    """
+    按 PEP 503 规范化包名：不区分大小写，'-'、'_'、'.' 视为相同
+    """
+    return re.sub(r"[-_.]+", "-", name).lower()
+
+
+@functools.lru_cache(maxsize=None)
+def installed_distributions() -> frozenset:
+    """
+    读取已安装包的元数据得到包名集合，不导入任何包，结果在进程内缓存
+    :return: 规范化后的已安装包名集合
+    """
+    return frozenset(_normalize(dist.metadata['Name'])
+                     for dist in importlib.metadata.distributions() if dist.metadata['Name'])
+
+
+def is_installed(package: str) -> bool:
+    """
+    判断包是否已安装
+    :param package: 包名（pip 安装时使用的名称，如 yt-dlp）
+    :return: 是否已安装
+    """
+    return _normalize(package) in installed_distributions()
+
+
+def read_requirements(path: Union[str, Path]) -> List[str]:
+    """
+    读取 requirements.txt 中的包名，忽略注释、pip 选项、版本约束和环境标记
+    :param path: requirements.txt 路径
+    :return: 包名列表
+    """
+    packages = []
+    with open(path, 'r', encoding='utf-8') as f:
+        for line in f:
+            line = line.split('#', 1)[0].strip()
+            if not line or line.startswith('-'):
+                continue
+            packages.append(re.split(r"[\s\[;<>=!~]", line, maxsplit=1)[0])
+    return packages
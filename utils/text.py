@@ -0,0 +1,12 @@
+def preview(text: str, width: int, placeholder: str = '...') -> str:
+    """
+    截取文本开头用于预览，超出长度时追加省略号
+    按字符截取而非 textwrap.shorten 的按词截取，中文等无空格文本也能正确截断
+    :param text: 原始文本
+    :param width: 保留的最大字符数（不含省略号）
+    :param placeholder: 截断时追加的省略标记
+    :return: 预览文本
+    """
+    if len(text) <= width:
+        return text
+    return text[:width] + placeholder